@@ -0,0 +1,85 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""benchmark the reference collection on a large config, the anchor maps scoped by `ChainMap` are compared with the deep-copied anchor maps for every node(the old implementation)
+
+Usage:
+    python benchmarks/bench_collect_refs.py [--leaves 50000]
+"""
+
+import argparse
+import copy
+import time
+
+from intc import Parser
+
+
+class CopyAnchorsParser(Parser):
+    """the old implementation, every node gets a deep copy of the anchor maps of its parent"""
+
+    @classmethod
+    def collect_refs(cls, *args, ref_anchor_maps, **kwargs):
+        return super(CopyAnchorsParser, cls).collect_refs(
+            *args, ref_anchor_maps=copy.deepcopy(dict(ref_anchor_maps)), **kwargs
+        )
+
+    @classmethod
+    def _collect_all_relative_refs(cls, *args, ref_anchor_maps, **kwargs):
+        return super(CopyAnchorsParser, cls)._collect_all_relative_refs(
+            *args, ref_anchor_maps=copy.deepcopy(dict(ref_anchor_maps)), **kwargs
+        )
+
+
+def build_config(leaves: int, modules: int = 20, width: int = 50):
+    """build a config with `modules` submodules and about `leaves` leaves, every submodule has an `_anchor` and a link"""
+    config = {"_anchor": "$"}
+    for i in range(modules):
+        module = {
+            "_anchor": f"m{i}",
+            "para0": 0,
+            "para1": 1,
+            "link": "@$.para0, @$.para1 @lambda x, y: x+y",
+        }
+        for j in range(max(leaves // modules // width, 1)):
+            module[f"group{j}"] = {f"para{k}": k for k in range(width)}
+        config[f"@module#{i}"] = module
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leaves", type=int, default=50000)
+    args = parser.parse_args()
+
+    results = {}
+    for name, parser_class in [
+        ("scoped anchors", Parser),
+        ("copied anchors", CopyAnchorsParser),
+    ]:
+        # the `_anchor` is popped when collecting, build a new config for every run
+        config = build_config(args.leaves)
+        ref_anchor_maps = {}
+        Parser.collect_global_anchors(config, ref_anchor_maps, trace="", root=True)
+        start = time.perf_counter()
+        refs = parser_class.collect_refs(
+            config,
+            config,
+            refs=[],
+            ref_anchor_maps=ref_anchor_maps,
+            trace="",
+            root=True,
+        )
+        results[name] = (refs, time.perf_counter() - start)
+    assert results["scoped anchors"][0] == results["copied anchors"][0]
+
+    print(f"leaves: {args.leaves}, refs: {len(results['scoped anchors'][0])}")
+    for name, (_, cost) in results.items():
+        print(f"{name}: {cost:.3f}s")
+    speedup = results["copied anchors"][1] / results["scoped anchors"][1]
+    print(f"speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""benchmark the `_from_dict`(or the batch `_from_dicts`) throughput of a registered config class
+
+Usage:
+    python benchmarks/bench_from_dict.py [--number 100000] [--batch]
+"""
+
+import argparse
+import time
+
+from intc import (
+    AnyField,
+    BoolField,
+    DictField,
+    FloatField,
+    IntField,
+    ListField,
+    StrField,
+    cregister,
+)
+
+
+@cregister("bench_from_dict", "shard")
+class ShardConfig:
+    """the config of a data shard"""
+
+    index = IntField(value=0, minimum=0, help="the shard index")
+    ratio = FloatField(value=1.0, minimum=0.0, maximum=1.0, help="the sample ratio")
+    shuffle = BoolField(value=True, help="shuffle the shard")
+    split = StrField(value="train", options=["train", "dev", "test"], help="split")
+    path = StrField(value="data", min_len=1, pattern=r"^[\w/]+$", help="path")
+    columns = ListField(value=["text"], additions=[None], help="the columns")
+    reader = DictField(value={"type": "jsonl"}, additions=[{}], help="the reader")
+    extra = AnyField(value=None, options=[None, [1, 2], {"k": "v"}], help="extra")
+
+
+def build_configs(number: int):
+    """build `number` shard configs"""
+    return [
+        {
+            "index": i,
+            "ratio": (i % 10) / 10,
+            "shuffle": bool(i % 2),
+            "split": ["train", "dev", "test"][i % 3],
+            "path": f"data/shard{i}",
+            "columns": ["text", "label"],
+            "reader": {"type": "jsonl", "lines": True},
+            "extra": [None, [1, 2], {"k": "v"}][i % 3],
+        }
+        for i in range(number)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100000)
+    parser.add_argument("--batch", action="store_true", help="use `_from_dicts`")
+    args = parser.parse_args()
+
+    configs = build_configs(args.number)
+    start = time.perf_counter()
+    if args.batch:
+        samples = ShardConfig._from_dicts(configs)
+    else:
+        samples = [ShardConfig._from_dict(config) for config in configs]
+    cost = time.perf_counter() - start
+    print(
+        f"configs: {args.number}, time: {cost:.3f}s, {args.number / cost:.0f} configs/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""measure the memory cost of the resident config objects
+
+Usage:
+    python benchmarks/bench_memory.py [--number 100000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from intc import FloatField, IntField, StrField, SubModule, cregister
+
+
+@cregister("bench_memory", "feature")
+class FeatureConfig:
+    """the feature config of a tenant"""
+
+    dim = IntField(value=16, minimum=1, help="the feature dim")
+    weight = FloatField(value=1.0, help="the feature weight")
+    name = StrField(value="feature", help="the feature name")
+
+
+@cregister("bench_memory", "feature_with_submodule")
+class FeatureWithSubmoduleConfig:
+    """the feature config with a submodule"""
+
+    dim = IntField(value=16, minimum=1, help="the feature dim")
+    weight = FloatField(value=1.0, help="the feature weight")
+    name = StrField(value="feature", help="the feature name")
+    submodule = SubModule({"bench_memory#child": {"_base": "feature"}})
+
+
+def measure(config_class, number: int) -> float:
+    """init `number` configs of the class by the same config, and return the traced bytes per instance"""
+    config = config_class()._to_dict(lazy=True)
+    gc.collect()
+    tracemalloc.start()
+    samples = config_class._from_dicts([config] * number)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del samples
+    return size / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    for config_class in [FeatureConfig, FeatureWithSubmoduleConfig]:
+        cost = measure(config_class, args.number)
+        print(f"{config_class.__name__}: {cost:.0f} bytes/instance")
+
+
+if __name__ == "__main__":
+    main()
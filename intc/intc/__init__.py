@@ -15,6 +15,7 @@ from intc.config import (
     StrField,
     SubModule,
     init_config,
+    init_configs,
 )
 from intc.exceptions import (
     NameError,
@@ -30,4 +31,6 @@ from intc.exceptions import (
 from intc.loader import Loader
 from intc.parser import Parser
 from intc.register import cregister, dataclass, ic_help, ic_repo, type_module_map
+from intc.search import SearchSpace
 from intc.share import MISSING
+from intc.snapshot import build_snapshot, load_snapshot
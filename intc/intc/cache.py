@@ -0,0 +1,81 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, Union
+
+from platformdirs import user_cache_dir
+
+# increase it when the format of the parsed configs is changed, the old cache files will be ignored
+CACHE_FORMAT_VERSION = 1
+
+
+class ConfigCache(object):
+    """the on-disk cache of the parsed configs
+
+    every entry is a dict stored in '{cache_dir}/{key}.pkl', the user of the cache should check the entry is still valid, like the `Parser` checks the used base configs and the `Loader` checks the mtime and size of the files.
+
+    """
+
+    def __init__(self, cache_dir: str = ""):
+        """
+        Args:
+            cache_dir: the directory of the cache files, default is the user cache directory(like `~/.cache/intc`)
+        """
+        super(ConfigCache, self).__init__()
+        self.cache_dir = cache_dir or user_cache_dir("intc")
+
+    def get_path(self, key: str) -> str:
+        """get the cache file path of the key"""
+        return os.path.join(self.cache_dir, f"v{CACHE_FORMAT_VERSION}-{key}.pkl")
+
+    def load(self, key: str) -> Union[Dict, None]:
+        """load the entry of the key
+
+        Args:
+            key: the cache key
+
+        Returns:
+            the cached entry, or None if the entry is not found or broken
+        """
+        path = self.get_path(key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except Exception:
+            return None
+        if not isinstance(entry, dict):
+            return None
+        return entry
+
+    def store(self, key: str, entry: Dict[str, Any]) -> bool:
+        """store the entry of the key, the file is replaced atomically, so the concurrent jobs never read a partial entry
+
+        Args:
+            key: the cache key
+            entry: the dict to store
+
+        Returns:
+            whether the entry is stored, the entry which can not be pickled is skipped
+        """
+        try:
+            data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.get_path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return True
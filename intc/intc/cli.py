@@ -0,0 +1,63 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""intc command line interface."""
+
+import argparse
+import sys
+from textwrap import dedent
+
+from intc.snapshot import build_project_snapshot
+
+
+def cli(args=None) -> None:
+    """intc cli entrypoint."""
+    parser = argparse.ArgumentParser(
+        prog="intc",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        description="intc: intelligent python config toolkit.",
+        epilog=dedent(
+            """\
+            Examples:
+
+                Build the registry snapshot of the project in current directory:
+                    intc snapshot build
+                Build to the specified file:
+                    intc snapshot build --root path/to/project --output path/to/snapshot
+            """
+        ),
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    snapshot_parser = subparsers.add_parser(
+        "snapshot", help="build the registry snapshot"
+    )
+    snapshot_subparsers = snapshot_parser.add_subparsers(dest="action")
+    build_parser = snapshot_subparsers.add_parser(
+        "build",
+        help="import the `src` packages in `.intc.json` and dump the registry to the snapshot",
+    )
+    build_parser.add_argument(
+        "--root",
+        help="the project root directory which contains the `.intc.json` (default current directory)",
+        type=str,
+        default=".",
+    )
+    build_parser.add_argument(
+        "--output",
+        help="the snapshot file path (default {root}/.intc.snapshot)",
+        type=str,
+        default="",
+    )
+    args = parser.parse_args(args)
+    if args.command == "snapshot" and args.action == "build":
+        path = build_project_snapshot(args.root, args.output)
+        print(f"The snapshot is saved to {path}")
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
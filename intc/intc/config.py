@@ -7,6 +7,7 @@
 the intc config module
 """
 import copy
+import functools
 import inspect
 import json
 import re
@@ -40,7 +41,13 @@ from intc.exceptions import (
     ValueValidateError,
 )
 from intc.share import MISSING, get_registed_instance, registry
-from intc.utils import UniModuleName, get_meta_rep, get_position, module_name_check
+from intc.utils import (
+    freeze_value,
+    get_meta_rep,
+    get_position,
+    get_uni_module_name,
+    module_name_check,
+)
 
 
 class CheckStatus(Enum):
@@ -49,6 +56,10 @@ class CheckStatus(Enum):
     SKIP = 2
 
 
+# the placeholder of the value which can not match any options or additions
+_UNMATCHED = object()
+
+
 class BasicCheck(object):
     """general check class, check the value is in options if options is not `None` or if the value is in additions skip all other check"""
 
@@ -74,39 +85,26 @@ class BasicCheck(object):
         assert isinstance(options, list) or options is None
         assert isinstance(suggestions, list) or suggestions is None
         assert isinstance(additions, list) or additions is None
+        # the options and additions are frozen to hashable values once, so the dict and list values can be looked up without dumping them to json
+        self.raw_options = options
         self.options = (
-            None
-            if options is None
-            else set(
-                [
-                    (
-                        json.dumps(o, sort_keys=True)
-                        if (isinstance(o, dict) or isinstance(o, list))
-                        else o
-                    )
-                    for o in options
-                ]
-            )
+            None if options is None else set(freeze_value(o) for o in options)
         )
         self.suggestions = (
             None
             if suggestions is None
-            else set([json.dumps(s, sort_keys=True) for s in suggestions])
+            else set(freeze_value(s) for s in suggestions)
         )
         self.additions = (
-            None
-            if additions is None
-            else set(
-                [
-                    (
-                        json.dumps(a, sort_keys=True)
-                        if (isinstance(a, dict) or isinstance(a, list))
-                        else a
-                    )
-                    for a in additions
-                ]
-            )
+            None if additions is None else set(freeze_value(a) for a in additions)
         )
+        self.check_member = self.options is not None or self.additions is not None
+        # the dict(list) value is frozen only when there are dict(list) values in options or additions
+        self.frozen_types = {
+            type(value)
+            for value in (self.options or set()) | (self.additions or set())
+            if isinstance(value, (frozenset, tuple))
+        }
         self.validator = validator
 
     def basic_check(self, value) -> Tuple[Any, CheckStatus]:
@@ -122,25 +120,29 @@ class BasicCheck(object):
         Returns:
             value and check status
         """
-        if value == MISSING or (
-            isinstance(value, str) and value.startswith("@") and "@lambda" in value
+        if isinstance(value, str) and (
+            value == MISSING or (value.startswith("@") and "@lambda" in value)
         ):
             # Skip check value for MISSING
             return value, CheckStatus.SKIP
-        dump_value = (
-            json.dumps(value, sort_keys=True)
-            if (isinstance(value, dict) or isinstance(value, list))
-            else value
-        )
-        if (self.additions is not None) and (dump_value in self.additions):
-            return value, CheckStatus.SKIP
-        if self.options is not None:
-            if dump_value not in self.options:
-                raise ValueValidateError(
-                    f"Value `{dump_value}` is not in {self.options}. {self.meta_str}"
+        if self.check_member:
+            frozen_value = value
+            if isinstance(value, (dict, list)):
+                frozen_type = frozenset if isinstance(value, dict) else tuple
+                frozen_value = (
+                    freeze_value(value)
+                    if frozen_type in self.frozen_types
+                    else _UNMATCHED
                 )
-            else:
+            if (self.additions is not None) and (frozen_value in self.additions):
                 return value, CheckStatus.SKIP
+            if self.options is not None:
+                if frozen_value not in self.options:
+                    raise ValueValidateError(
+                        f"Value `{value}` is not in {self.raw_options}. {self.meta_str}"
+                    )
+                else:
+                    return value, CheckStatus.SKIP
         if self.validator is not None and not self.validator(value):
             validate_code = inspect.getsource(self.validator)
             raise ValueValidateError(
@@ -193,12 +195,15 @@ class NumConvert(BasicCheck):
 
     def __call__(self, value):
         check_value, check_status = self.basic_check(value)
-        if check_status == CheckStatus.SKIP:
+        if check_status is CheckStatus.SKIP:
             return check_value
-        try:
-            value = self.type_class(value)
-        except Exception as e:
-            raise ValueTypeError(f"Cannot convert '{value}' to int. {self.meta_str}")
+        if value.__class__ is not self.type_class:
+            try:
+                value = self.type_class(value)
+            except Exception as e:
+                raise ValueTypeError(
+                    f"Cannot convert '{value}' to {self.type_class.__name__}. {self.meta_str}"
+                )
         if value > self.maximum or value < self.minimum:
             raise ValueOutOfRangeError(
                 f"Value {value} is not in range [{self.minimum}, {self.maximum}]. {self.meta_str}"
@@ -247,17 +252,21 @@ class StrConvert(BasicCheck):
         self.min_len = min_len
         self.max_len = max_len
         self.pattern = None if pattern is None else re.compile(pattern)
+        self.check_len = min_len is not None or max_len is not None
 
     def __call__(self, value):
         check_value, check_status = self.basic_check(value)
 
-        if check_status == CheckStatus.SKIP:
+        if check_status is CheckStatus.SKIP:
             return check_value
-        try:
-            value = str(value)
-        except Exception as e:
-            raise ValueTypeError(f"Cannot convert '{value}' to string. {self.meta_str}")
-        if self.min_len is not None or self.max_len is not None:
+        if value.__class__ is not str:
+            try:
+                value = str(value)
+            except Exception as e:
+                raise ValueTypeError(
+                    f"Cannot convert '{value}' to string. {self.meta_str}"
+                )
+        if self.check_len:
             str_len = len(value)
             if self.min_len is not None and str_len < self.min_len:
                 raise ValueOutOfRangeError(
@@ -306,7 +315,7 @@ class BasicConvert(BasicCheck):
 
     def __call__(self, value):
         check_value, check_status = self.basic_check(value)
-        if check_status in {CheckStatus.SKIP, check_status.PASS}:
+        if check_status is CheckStatus.SKIP or check_status is CheckStatus.PASS:
             return check_value
         raise ValueError(f"Value {value} is not pass the value check")
 
@@ -794,14 +803,21 @@ def EnumField(
 
 
 class ModuleField(object):
+    """the submodules of the config, the child data is owned by the ModuleField(the `SubmoduleConvert` copies it from the caller once) and never modified, the copies of the ModuleField share it and the child modules are inited on the first access, so copying the ModuleField does not walk the submodule tree"""
+
+    # the configs may be kept resident by the millions, so the ModuleField has no per-instance `__dict__`
+    __slots__ = ("__child_data__", "__child_module__", "__uni_origin_keys_map__")
+
     def __init__(self, child_data):
-        self.__child_data__ = copy.deepcopy(child_data)
-        self.__child_module__ = {}
-        self.__uni_origin_keys_map__ = {}
+        self.__child_data__ = child_data
+        # the dict of the inited child modules is created on the first write
+        self.__child_module__ = None
         self.__update_unikeys__()
 
     def __get_module__(self, key, value):
-        if key in self.__child_module__:
+        if self.__child_module__ is None:
+            self.__child_module__ = {}
+        elif key in self.__child_module__:
             return self.__child_module__[key]
         module_type_names = key.lstrip("@").split("#")[0].split("@")
         module_type, module_name = "", ""
@@ -822,7 +838,10 @@ class ModuleField(object):
         child_class = get_registed_instance(module_type, module_name, get_class=True)
         child_class.__meta__ = {"_base": module_name}
         try:
-            self.__child_module__[key] = child_class._from_dict(value)
+            # the value is a part of the owned child data, it is passed to the child module as the ModuleField and need not copy again
+            self.__child_module__[key] = child_class._from_dicts(
+                [value], copy_submodule=False
+            )[0]
         except Exception as e:
             raise ValueError(
                 f"Init the {module_type}@{module_name} {child_class}, error: {e}"
@@ -830,14 +849,16 @@ class ModuleField(object):
         return self.__child_module__[key]
 
     def __deepcopy__(self, memo):
+        # the child data is shared, only the inited child modules(which may be modified) are copied
         new_module = ModuleField(self.__child_data__)
-        new_module.__child_module__ = copy.deepcopy(self.__child_module__)
-        new_module.__uni_origin_keys_map__ = copy.deepcopy(self.__uni_origin_keys_map__)
+        if self.__child_module__:
+            new_module.__child_module__ = copy.deepcopy(self.__child_module__, memo)
         return new_module
 
     def __update_unikeys__(self):
-        self.__uni_origin_keys_map__ = UniModuleName(
-            [f"@{key}" for key in self.__child_data__.keys()]
+        # the UniModuleName is shared by the ModuleFields which have the same keys
+        self.__uni_origin_keys_map__ = get_uni_module_name(
+            tuple(f"@{key}" for key in self.__child_data__.keys())
         )
 
     def __iter__(self):
@@ -850,6 +871,9 @@ class ModuleField(object):
         return self.__get_module__(key[1:], self.__child_data__[key[1:]])
 
     def __getattr__(self, attr):
+        if attr.startswith("__") and attr.endswith("__"):
+            # the special attributes(like the unset slots) are never the submodules
+            raise AttributeError(attr)
         return self.__getitem__(attr)
 
     def __len__(self):
@@ -904,9 +928,10 @@ def NestField(
     }
     if suggestions is not None:
         json_schema["suggestions"] = suggestions
+    nest_class = define(value)
     return field(
-        default=define(value)(),
-        converter=NestConvert(define(value)),
+        default=nest_class(),
+        converter=NestConvert(nest_class),
         type=type,
         metadata=json_schema,
     )
@@ -924,7 +949,13 @@ def SubmoduleConvert(
         the value itself
     """
 
-    def _(childs: Dict):
+    def _(childs: Union[Dict, ModuleField]):
+        if isinstance(childs, ModuleField):
+            # the child data owned by the ModuleField is never modified, share it without copying
+            childs = childs.__child_data__
+        else:
+            # copy the child data from the caller once, so modifying it later does not change the inited object
+            childs = copy.deepcopy(childs)
         if valadator is not None and not valadator(childs):
             raise ValueValidateError(
                 f"{meta_str}\nValue {childs} is not pass the validator."
@@ -983,6 +1014,8 @@ class IntCMeta(type):
         reserved = {
             "_module_name",
             "_from_dict",
+            "_from_dicts",
+            "_route_keys",
             "_to_dict",
             "_get_module",
             "__meta__",
@@ -1035,19 +1068,62 @@ class Base(metaclass=IntCMeta):
     submodule = SubModule({})
 
     @classmethod
-    def _from_dict(cls: Type[BaseType], config: Dict = {}) -> BaseType:
-        new_config = {}
-        for key in config:
+    @functools.lru_cache(maxsize=4096)
+    def _route_keys(
+        cls, keys: Tuple[str, ...]
+    ) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, str], ...]]:
+        """route the config keys to the init parameters of the class, the `@` prefixed keys are routed to the `submodule` and the special keys are dropped, the route of the same keys is computed only once for every class
+
+        Args:
+            keys: the keys of the config
+
+        Returns:
+            the parameter keys and the (config key, submodule name) pairs
+        """
+        para_keys, submodule_keys = [], []
+        for key in keys:
             if key in {"_base", "_name", "_search", "_G", "_anchor"}:
                 continue
             elif key.startswith("@"):
-                new_config["submodule"] = new_config.get("submodule", {})
-                new_config["submodule"][key[1:].strip()] = config[key]
+                submodule_keys.append((key, key[1:].strip()))
             else:
-                new_config[key] = config[key]
-        sample = cls(**new_config)
-        sample._valid_check()
-        return sample
+                para_keys.append(key)
+        return tuple(para_keys), tuple(submodule_keys)
+
+    @classmethod
+    def _from_dict(cls: Type[BaseType], config: Dict = {}) -> BaseType:
+        return cls._from_dicts([config])[0]
+
+    @classmethod
+    def _from_dicts(
+        cls: Type[BaseType], configs: List[Dict], copy_submodule: bool = True
+    ) -> List[BaseType]:
+        """init the configs of the class at once, the configs have the same keys(like the configs expanded from the `_search`) share the key route
+
+        NOTE: the values are still checked config by config by the attrs `__init__`. Checking the fields column by column(converting every distinct value once) needs building the instances without the `__init__`, which is slower than the scalar converters it saves, and the list, dict and submodule values can not be deduplicated cheaply.
+
+        Args:
+            configs: the config dicts
+            copy_submodule: copy the child data of the submodules(by the `SubmoduleConvert`), so modifying the configs later does not change the inited objects. The ModuleField inits the child modules from the data it owns without copying
+
+        Returns:
+            the list of the config objects
+        """
+        samples = []
+        for config in configs:
+            para_keys, submodule_keys = cls._route_keys(tuple(config))
+            new_config = {key: config[key] for key in para_keys}
+            if submodule_keys:
+                submodule = dict(new_config.get("submodule", {}))
+                for key, name in submodule_keys:
+                    submodule[name] = config[key]
+                new_config["submodule"] = submodule
+            if not copy_submodule and "submodule" in new_config:
+                new_config["submodule"] = ModuleField(new_config["submodule"])
+            sample = cls(**new_config)
+            sample._valid_check()
+            samples.append(sample)
+        return samples
 
     @property
     def _module_name(self):
@@ -1150,8 +1226,9 @@ class Base(metaclass=IntCMeta):
                 for key in self.submodule:
                     result[f"@{key}"] = self.submodule[key]._to_dict(only_para)
             else:
+                # the child data is shared with the ModuleField, never return it directly
                 for key, value in self.submodule.__child_data__.items():
-                    result[f"@{key}"] = value
+                    result[f"@{key}"] = copy.deepcopy(value)
         if not only_para and "__meta__" in self.__dir__():
             if self.__meta__.get("_base", ""):
                 result["_name"] = self.__meta__["_base"]
@@ -1175,5 +1252,23 @@ def init_config(config, DataClass: Type[BaseType] = Base) -> BaseType:
     return DataClass._from_dict(config)
 
 
+def init_configs(
+    configs: List[Dict], DataClass: Type[BaseType] = Base
+) -> List[BaseType]:
+    """the batch version of `init_config`
+
+    Args:
+        configs: the config dicts
+        DataClass: the DataClass to init the configs
+
+    Returns:
+        the list of the config objects
+    """
+    for config in configs:
+        for key in ["_G", "_search", "_anchor"]:
+            config.pop(key, "")
+    return DataClass._from_dicts(configs)
+
+
 if __name__ == "__main__":
     pass
@@ -3,17 +3,30 @@
 # This source code is licensed under the Apache license found in the
 # LICENSE file in the root directory of this source tree.
 
+import collections
 import copy
 import json
 import os
-from typing import Dict, List, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple, Union
 
 import hjson
 import yaml
 
 import intc.share as G
-from intc.exceptions import NameError, RepeatRegisterError
+from intc.cache import ConfigCache
+from intc.exceptions import NameError, RepeatRegisterError, ValueError
 from intc.register import cregister, ic_help, ic_repo
+from intc.utils import Lazy, config_digest
+
+# orjson is optional, it is much faster than json for the large number of module files
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# the C-accelerated yaml loader is only available when the pyyaml is built with libyaml
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 def load_submodule(cur_dir: str = None):
@@ -31,36 +44,111 @@ def load_submodule(cur_dir: str = None):
         return
     intc_rc_config = hjson.load(open(intc_rc_config_path, "r"), object_pairs_hook=dict)
     modules = intc_rc_config.get("module", [])
-    loader = Loader(ignore_error=True)
+    # the loader options like {"workers": 8, "cache": true}
+    loader = Loader(ignore_error=True, **intc_rc_config.get("loader", {}))
     for module in modules:
         module_path = os.path.join(cur_dir, module)
         loader.load_files(module_path)
+    # the modules whose base is loaded after them
+    loader.resolve()
+
+
+def _load_file_in_worker(file_path: str) -> Tuple[Any, Union[Exception, None]]:
+    """load the file in the worker process, the error is converted to the picklable one"""
+    data, error = Loader.try_load_file(file_path)
+    if error is not None:
+        error = ValueError(f"Load {file_path} failed: {type(error).__name__}: {error}")
+    return data, error
 
 
 class Loader(object):
     """load config from repo paths"""
 
-    def __init__(self, ignore_error=False):
+    # the file extension -> the load method
+    loaders = {
+        ".json": "load_json",
+        ".hjson": "load_hjson",
+        ".jsonc": "load_hjson",
+        ".yaml": "load_yaml",
+        ".yml": "load_yaml",
+    }
+
+    def __init__(
+        self, ignore_error=False, workers: int = 0, cache: Union[bool, str] = False
+    ):
+        """
+        Args:
+            ignore_error: skip the files which can not be loaded
+            workers: the number of the worker processes to parser the files, parser the files in current process if workers <= 1
+            cache: keep the parsed files in a manifest on the disk if it is True(in the user cache directory) or a directory path, the file is parsed again only if its mtime or size is changed
+        """
         super(Loader, self).__init__()
         self.ignore_error = ignore_error
+        self.workers = workers
+        self.cache = None
+        if cache:
+            self.cache = ConfigCache(cache if isinstance(cache, str) else "")
         self.stashed = {}
 
     def resolve(self):
-        """resolve dependency
+        """resolve the dependency of the stashed modules, the module is stored after its base in one pass(topological order)
+
         Returns:
             None
+
+        Raises:
+            NameError: some modules can not be resolved because of the missing bases or the circle dependency, the resolvable modules are still stored. Not raised if ignore_error.
         """
+        # base -> the stashed modules inherit it
+        children = collections.defaultdict(list)
+        ready = collections.deque()
+        for key, config in self.stashed.items():
+            if config["base"] in ic_repo:
+                ready.append(key)
+            else:
+                children[config["base"]].append(key)
+
+        while ready:
+            key = ready.popleft()
+            self.store(key, self.stashed.pop(key))
+            ready.extend(children.pop(key, []))
+
+        if not self.stashed or self.ignore_error:
+            return
 
-        while self.stashed:
-            circle_flag = True
-            for key in self.stashed:
-                if self.stashed[key]["base"] in ic_repo:
-                    self.store(key, self.stashed[key])
-                    del self.stashed[key]
-                    circle_flag = False
-                    break
-            if circle_flag:
-                raise NameError(f"Unresolved dependency {self.stashed}")
+        errors = []
+        for base, keys in children.items():
+            if base not in self.stashed:
+                paths = [path for key in keys for path in self.stashed[key]["path"]]
+                errors.append(
+                    f"The base module {base} is not found, required by: {paths}"
+                )
+        for circle in self.find_circles():
+            errors.append(
+                f"The modules inherit circularly: {' -> '.join(str(key) for key in circle)}"
+            )
+        raise NameError("Unresolved dependency:\n" + "\n".join(errors))
+
+    def find_circles(self) -> List[List[tuple]]:
+        """find the circles of the inheritance in the stashed modules, every module has only one base, so every module is in at most one circle
+
+        Returns:
+            list of circle, like [[a, b, a]]
+        """
+        circles = []
+        visited = set()
+        for start in self.stashed:
+            path = []
+            on_path = {}
+            key = start
+            while key in self.stashed and key not in visited:
+                visited.add(key)
+                on_path[key] = len(path)
+                path.append(key)
+                key = self.stashed[key]["base"]
+            if key in on_path:
+                circles.append(path[on_path[key] :] + [key])
+        return circles
 
     def store(self, key: tuple, config: dict):
         """
@@ -71,9 +159,14 @@ class Loader(object):
 
         """
         ic_repo[key] = copy.deepcopy(config["config"])
-        base_help = copy.deepcopy(ic_help.get(config["base"], {}))
-        base_help["inter_files"] = base_help.get("inter_files", []) + config["path"]
-        ic_help[key] = base_help
+
+        def get_help():
+            # the help of the base is derived on the first access of the help
+            base_help = copy.deepcopy(ic_help.get(config["base"], {}))
+            base_help["inter_files"] = base_help.get("inter_files", []) + config["path"]
+            return base_help
+
+        ic_help[key] = Lazy(get_help)
 
     def stash(self, config: Dict, file_path, base: tuple, key: tuple):
         """stash the config to the repo, and wait for resolve the dependency
@@ -143,44 +236,116 @@ class Loader(object):
             None
         """
 
+        file_paths = []
         for root, dirs, files in os.walk(config_dir):
             for file in files:
-                try:
-                    if file.startswith("_") or file in exclude:
-                        continue
-
-                    file_path = os.path.join(root, file)
-                    file_ext = os.path.splitext(file)[1].lower()
-                    data = None
-
-                    # Load JSON file
-                    if file_ext == ".json":
-                        data = self.load_json(file_path)
-
-                    # Load HJSON file
-                    elif file_ext == ".hjson" or file_ext == ".jsonc":
-                        data = self.load_hjson(file_path)
-
-                    # Load YAML file
-                    elif file_ext == ".yaml" or file_ext == ".yml":
-                        data = self.load_yaml(file_path)
-                    if data:
-                        key_module_type, key_module_name = self.get_key(file_path)
-                        base_module_name = self.get_base(data)
-                        self.stash(
-                            data,
-                            file_path,
-                            (key_module_type, base_module_name),
-                            (key_module_type, key_module_name),
-                        )
-                except Exception as e:
-                    if not self.ignore_error:
-                        raise e
+                if file.startswith("_") or file in exclude:
+                    continue
+                if os.path.splitext(file)[1].lower() in self.loaders:
+                    file_paths.append(os.path.join(root, file))
+
+        for file_path, (data, error) in zip(
+            file_paths, self.load_datas(config_dir, file_paths)
+        ):
+            try:
+                if error is not None:
+                    raise error
+                if data:
+                    key_module_type, key_module_name = self.get_key(file_path)
+                    base_module_name = self.get_base(data)
+                    self.stash(
+                        data,
+                        file_path,
+                        (key_module_type, base_module_name),
+                        (key_module_type, key_module_name),
+                    )
+            except Exception as e:
+                if not self.ignore_error:
+                    raise e
         return
 
+    def load_datas(
+        self, config_dir: str, file_paths: List[str]
+    ) -> List[Tuple[Any, Union[Exception, None]]]:
+        """load the files, the unchanged files are loaded from the manifest cache, and the others are parsered in the worker processes(if workers > 1)
+
+        Args:
+            config_dir: the config directory, the manifest is kept for each directory
+            file_paths: the files to load
+
+        Returns:
+            [(data, error)] of each file
+        """
+        manifest_key = f"manifest-{config_digest(os.path.abspath(config_dir))}"
+        manifest = {}
+        if self.cache is not None:
+            manifest = self.cache.load(manifest_key) or {}
+
+        results: Dict[str, Tuple[Any, Union[Exception, None]]] = {}
+        stats = {}
+        new_paths = []
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path)
+                stats[file_path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError as e:
+                results[file_path] = (None, e)
+                continue
+            cached = manifest.get(file_path)
+            if cached is not None and cached["stat"] == stats[file_path]:
+                results[file_path] = (cached["data"], None)
+            else:
+                new_paths.append(file_path)
+
+        if self.workers > 1 and len(new_paths) > 1:
+            chunk_size = max(1, len(new_paths) // (self.workers * 4))
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                new_results = list(
+                    executor.map(_load_file_in_worker, new_paths, chunksize=chunk_size)
+                )
+        else:
+            new_results = [self.try_load_file(file_path) for file_path in new_paths]
+        results.update(zip(new_paths, new_results))
+
+        if self.cache is not None:
+            new_manifest = {
+                file_path: {"stat": stats[file_path], "data": results[file_path][0]}
+                for file_path in stats
+                if results[file_path][1] is None
+            }
+            if new_manifest.keys() != manifest.keys() or any(
+                file_path in new_manifest for file_path in new_paths
+            ):
+                self.cache.store(manifest_key, new_manifest)
+        return [results[file_path] for file_path in file_paths]
+
+    @classmethod
+    def try_load_file(cls, file_path: str) -> Tuple[Any, Union[Exception, None]]:
+        """load the file by the extension, the error is returned instead of raised, so one bad file will not break the worker pool
+
+        Args:
+            file_path: the file path
+
+        Returns:
+            (data, error)
+        """
+        try:
+            file_ext = os.path.splitext(file_path)[1].lower()
+            return getattr(cls, cls.loaders[file_ext])(file_path), None
+        except Exception as e:
+            return None, e
+
     @staticmethod
     def load_json(file_path: str) -> Dict:
         """Load JSON file"""
+        if orjson is not None:
+            with open(file_path, "rb") as f:
+                content = f.read()
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # the json module is more tolerant, like NaN and Infinity
+                pass
         with open(file_path, "r") as f:
             data = json.load(f)
         return data
@@ -196,5 +361,5 @@ class Loader(object):
     def load_yaml(file_path: str) -> Dict:
         """Load YAML file"""
         with open(file_path, "r") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=YamlLoader)
         return data
@@ -3,18 +3,36 @@
 # This source code is licensed under the Apache license found in the
 # LICENSE file in the root directory of this source tree.
 
+import collections
+import contextlib
 import copy
+import itertools
 import json
-from typing import Any, Callable, Dict, List, Type, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import intc.share as G
-from intc.config import Base, BaseType, init_config
+from intc.cache import ConfigCache
+from intc.config import Base, BaseType, init_config, init_configs
 from intc.exceptions import KeyNotFoundError, ParserConfigRepeatError, ValueError
 from intc.loader import load_submodule
 from intc.register import cregister, ic_repo
 from intc.share import MISSING
 from intc.utils import (
+    ReIterable,
     TryTrie,
+    compile_lambda,
+    config_digest,
     do_update_config,
     fix_trace,
     parser_lambda_key_value_pair,
@@ -22,6 +40,66 @@ from intc.utils import (
     split_trace,
 )
 
+# the resolved base configs, {(module_type, module_name): config}, the cache is cleared when the ic_repo is modified
+_base_config_cache: Dict = {"version": -1, "configs": {}}
+# the active recorders of the base config keys used by the parser, see `record_base_config_keys`
+_base_config_recorders: List[set] = []
+
+
+@contextlib.contextmanager
+def record_base_config_keys() -> Iterator[set]:
+    """record the (module_type, module_name) of the base configs used in the context
+
+    Yields:
+        the set of the used keys, it is updated until the context exits
+    """
+    recorder = set()
+    _base_config_recorders.append(recorder)
+    try:
+        yield recorder
+    finally:
+        _base_config_recorders.remove(recorder)
+
+
+def add_base_config_keys(keys):
+    """add the used base config keys to the active recorders, for the keys used by other process"""
+    for recorder in _base_config_recorders:
+        recorder.update(keys)
+
+
+class RefPlan(object):
+    """The link plan of the configs which share the same structure
+
+    The collected anchors and references of a config only depend on the structure of the config(the keys, the list length, the `_anchor` and the `@lambda` values), so the configs only differ in other leaf values can replay the same plan.
+    """
+
+    def __init__(self, refs: List, anchor_traces: List[List]):
+        """
+        Args:
+            refs: the refs collected by `Parser.collect_refs`
+            anchor_traces: the traces of the dicts which contain `_anchor`
+        """
+        super(RefPlan, self).__init__()
+        self.refs = refs
+        self.sorted_refs = Parser.sort_refs(refs) if refs else []
+        self.anchor_traces = anchor_traces
+
+    def apply(self, config: Dict) -> Dict:
+        """inplace link the config by the plan
+
+        Args:
+            config: the config has the same structure as the config the plan built from
+
+        Returns:
+            linked config
+        """
+        for trace in self.anchor_traces:
+            anchor_config = config
+            for key in trace:
+                anchor_config = anchor_config[key]
+            anchor_config.pop("_anchor", None)
+        return Parser.do_parser_refs(self.refs, config, self.sorted_refs)
+
 
 class Parser(object):
     reserved = {"_name", "_search", "_anchor", "submodule"}
@@ -37,12 +115,28 @@ class Parser(object):
         raw_config: Dict,
         module_type: str = "__root__",
         update_config: Union[Dict, None] = None,
+        cache: Union[bool, str] = False,
     ):
+        """
+        Args:
+            raw_config: the config to parser
+            module_type: the module type of the config, the default is the root config
+            update_config: {"trace.of.key": value} to update the raw_config
+            cache: cache the parsed configs on the disk if it is True(in the user cache directory) or a directory path, the cache is invalid once the config, the update_config or the used base configs are changed
+        """
         super(Parser, self).__init__()
         if not G.LOAD_SUBMODULE_DONE:
             load_submodule()
+        self.cache = None
+        self.cache_key = ""
+        if cache:
+            self.cache = ConfigCache(cache if isinstance(cache, str) else "")
+            # the raw_config will be modified, so the key should be computed first
+            self.cache_key = config_digest([module_type, raw_config, update_config])
         self.search = {}
         self.root = False
+        # the link plans of the expanded configs, {ref_fingerprint: RefPlan}
+        self.ref_plans: Dict[Any, RefPlan] = {}
         self.module_type = module_type
         if module_type == "_G":
             self.raw_config = copy.deepcopy(raw_config)
@@ -67,24 +161,30 @@ class Parser(object):
         if "submodule" in self.raw_config:
             raise ValueError("the 'submodule' key is reserved")
 
-        # get base config
+        # get base config, the base config is shared with the cache, so it should not be modified inplace
         if self.raw_config.get("_base", ""):
-            self.base_config = self.get_base_config(
+            self.base_config = self._get_cached_base_config(
                 module_type, self.raw_config["_base"]
             )
         elif self.raw_config.get("_name", ""):
-            self.base_config = self.get_base_config(
+            self.base_config = self._get_cached_base_config(
                 module_type, self.raw_config["_name"]
             )
         elif not self.root:
-            self.base_config = self.get_base_config(module_type, "")
+            self.base_config = self._get_cached_base_config(module_type, "")
         else:
             self.base_config = {}
 
         self.raw_config.pop("_base", {})
 
         # get the module _anchor
-        ref_anchor = self.base_config.pop("_anchor", "$")
+        ref_anchor = self.base_config.get("_anchor", "$")
+        if "_anchor" in self.base_config:
+            self.base_config = {
+                key: value
+                for key, value in self.base_config.items()
+                if key != "_anchor"
+            }
         assert (
             ref_anchor == "$"
         ), f"the _anchor of only support for the final config(which should not be inherited)"
@@ -156,101 +256,346 @@ class Parser(object):
         new_config = do_update_config(base_config, fix_update_config)
         return new_config
 
-    def parser_init(self, DataClass: Type[BaseType] = Base) -> List[BaseType]:
+    def parser_init(
+        self, DataClass: Type[BaseType] = Base, workers: int = 0
+    ) -> List[BaseType]:
         """parser the config, check the config is valid, and init the DataClass
 
         Args:
-            parser_ref: whether parser the reference
+            DataClass: the DataClass to init the config, if the DataClass is None or False, return the config dicts
+            workers: the number of the worker processes to parser and check the configs, the DataClass is always inited in current process
 
         Returns: all valided init config(if the DataClass is not None or False)
 
         """
-        configs = self.parser(parser_ref=True)
-        self.check_config(configs)
+        configs = self._parser(parser_ref=True, workers=workers, check=True)
 
         if not DataClass:
             return configs
 
-        return [init_config(config, DataClass) for config in configs]
+        return init_configs(configs, DataClass)
 
-    def parser(self, parser_ref=True) -> List:
+    def parser_init_iter(
+        self, DataClass: Type[BaseType] = Base, check_repeat=True
+    ) -> Iterator[BaseType]:
+        """the streaming version of `parser_init`, parser, check and init the config one by one
+
+        Args:
+            DataClass: the DataClass to init the config, if the DataClass is None or False, yield the config dict
+            check_repeat: whether check the repeat configs, see `iter_parser`
+
+        Yields: valided init config(if the DataClass is not None or False)
+
+        """
+        for config in self.iter_parser(parser_ref=True, check_repeat=check_repeat):
+            self.check_config(config)
+            if not DataClass:
+                yield config
+            else:
+                yield init_config(config, DataClass)
+
+    def parser(self, parser_ref=True, workers: int = 0) -> List:
         """parser the config
 
         Args:
             parser_ref: whether parser the links
+            workers: the number of the worker processes, the configs are expanded and linked in parallel if workers > 1, the order of the configs is not changed
 
         Returns: all valided configs
 
+        """
+        return self._parser(parser_ref=parser_ref, workers=workers)
+
+    def _parser(self, parser_ref=True, workers: int = 0, check=False) -> List:
+        """parser the config by the disk cache, the process pool or the current process
+
+        Args:
+            parser_ref: whether parser the links
+            workers: the number of the worker processes
+            check: whether check the configs
+
+        Returns: all valided configs
+
+        """
+        if self.cache is None:
+            return self._parser_configs(parser_ref, workers, check)
+
+        key = f"{self.cache_key}-{int(parser_ref)}"
+        entry = self.cache.load(key)
+        if entry is not None and "configs" in entry and all(
+            self.base_config_digest(*dep) == digest
+            for dep, digest in entry.get("deps", {}).items()
+        ):
+            if check:
+                self.check_config(entry["configs"])
+            return entry["configs"]
+
+        with record_base_config_keys() as deps:
+            configs = self._parser_configs(parser_ref, workers, check)
+        self.cache.store(
+            key,
+            {
+                "deps": {dep: self.base_config_digest(*dep) for dep in deps},
+                "configs": configs,
+            },
+        )
+        return configs
+
+    def _parser_configs(self, parser_ref=True, workers: int = 0, check=False) -> List:
+        """parser the config in the process pool if workers > 1, else in the current process"""
+        if workers > 1:
+            # the search module depends on the parser module
+            from intc.search import parallel_parser
+
+            return parallel_parser(
+                self, parser_ref=parser_ref, check=check, workers=workers
+            )
+        configs = list(self.iter_parser(parser_ref=parser_ref))
+        if check:
+            self.check_config(configs)
+        return configs
+
+    def iter_parser(self, parser_ref=True, check_repeat=True) -> Iterator[Dict]:
+        """parser the config lazily, the possible configs are expanded, linked and yielded one by one, so the configs are not kept in memory
+
+        NOTE: to detect the repeat config, a fixed size digest(and the index) of every yielded config is kept, so the memory cost still grows linearly(but slowly) with the size of the search space. Set `check_repeat=False` to skip the check and keep the memory cost constant.
+
+        Args:
+            parser_ref: whether parser the links
+            check_repeat: whether check the repeat configs
+
+        Yields: valided config
+
+        """
+        # digest -> index of the yielded configs, used to detect the repeat config, only the fixed size digest is kept for each config
+        yielded_digests: Dict[str, int] = {}
+
+        for index, (config, axes) in enumerate(self._iter_expand()):
+            # the expanded configs share the unchanged subtrees with each other, copy it before link and return
+            config = copy.deepcopy(config)
+
+            # link paras
+            if parser_ref:
+                config = self.link_config(config)
+
+            if check_repeat:
+                digest = self.config_digest(config)
+                if digest in yielded_digests:
+                    self.raise_repeat_config(
+                        config, index, yielded_digests[digest], axes
+                    )
+                yielded_digests[digest] = index
+
+            yield self.drop_root(config)
+
+    def raise_repeat_config(
+        self,
+        config: Dict,
+        index: int,
+        repeat_index: int,
+        axes: Union[Dict, None] = None,
+    ):
+        """report the repeat config and the search paras produced the collision
+
+        Args:
+            config: the repeat config
+            index: the index of the repeat config
+            repeat_index: the index of the config which is the same as the repeat config
+            axes: the search paras of the repeat config({"fixed.trace": (candidate index, value)}), recomputed if not provided
+
+        Raises:
+            ParserConfigRepeatError
+
+        """
+        # the repeat is rare, so the search paras are recomputed instead of stored for every config
+        if axes is None:
+            _, axes = next(itertools.islice(self._iter_expand(), index, None))
+        _, repeat_axes = next(itertools.islice(self._iter_expand(), repeat_index, None))
+        collision = self.diff_search_axes(repeat_axes, axes)
+        print(f"Found Repeat Configs")
+        print(f"The {index}th Configure is the same as the {repeat_index}th Configure:")
+        print(json.dumps(config, indent=2, ensure_ascii=False))
+        print(f"The search paras produced the collision:")
+        print(json.dumps(collision, indent=2, ensure_ascii=False))
+        raise ParserConfigRepeatError(
+            f"REPEAT CONFIG, the {index}th config is the same as the {repeat_index}th config, the collision search paras: {collision}"
+        )
+
+    def diff_search_axes(self, axes: Dict, other_axes: Dict) -> Dict:
+        """compare the search paras of two expanded configs, all the search paras are reported, the candidates may be equal even if the candidate indexes are different
+
+        Args:
+            axes: the search paras of one config, {"fixed.trace": (candidate index, value)}
+            other_axes: the search paras of another config
+
+        Returns:
+            {"fixed.trace": {"index": [index, other_index], "value": [value, other_value], "differ": index != other_index}}, the index of the missing search para is None, the '@__root__init__.' prefix of the root parser is dropped
+
+        """
+        collision = {}
+        for key in list(axes) + [key for key in other_axes if key not in axes]:
+            index, value = axes.get(key, (None, MISSING))
+            other_index, other_value = other_axes.get(key, (None, MISSING))
+            if self.root and key.startswith("@__root__init__."):
+                key = key[len("@__root__init__.") :]
+            collision[key] = {
+                "index": [index, other_index],
+                "value": [value, other_value],
+                "differ": index != other_index,
+            }
+        return collision
+
+    def _iter_expand(self) -> Iterator[Tuple[Dict, Dict]]:
+        """expand the submodules and the search paras, the expanded configs share the unchanged subtrees, so they must not be modified inplace
+
+        Yields: expanded config(without link and drop root), and the search paras produced it({"fixed.trace": (candidate index, value)})
+
         """
         # parser submodules get submodules config
         modules_config = {}
         for module_type in self.raw_config:
-            modules_config[module_type] = self.get_kind_module_base_config(
+            modules_config[module_type] = self._get_kind_module_expansions(
                 self.raw_config[module_type], module_type
             )
 
-        # expand all submodules to combine a set of module configs
-        possible_config_list = self.get_named_list_cartesian_prod(modules_config)
-
-        # flat all search paras
-        all_possible_config_list = []
-        for possible_config in possible_config_list:
-            fix_search_para = {}
-            for key, value in self.search.items():
-                fix_search_para[fix_trace(key, possible_config)] = value
-            search = search_lambda_eval(fix_search_para)
-            all_possible_config_list.extend(
-                self.flat_search(search, possible_config, self.module_type)
+        # expand all submodules to combine a set of module configs, the expansions are pulled on demand, so the first config is yielded before the whole space is expanded
+        for possible_expansion in self.iter_lazy_named_cartesian_prod(modules_config):
+            possible_config = {}
+            module_axes = {}
+            for module_type, (module_config, axes) in possible_expansion.items():
+                possible_config[module_type] = module_config
+                for key, value in axes.items():
+                    module_axes[f"{module_type}.{key}"] = value
+            # flat all search paras
+            search = self.get_search_para(possible_config)
+            for config, search_axes in self._iter_flat_search(
+                search, possible_config, self.module_type
+            ):
+                yield config, {**module_axes, **search_axes}
+
+    def get_search_para(self, possible_config: Dict) -> Dict:
+        """fix the search keys by the possible_config and eval the search lambda
+
+        Args:
+            possible_config: one of the combined module config
+
+        Returns:
+            the search paras, {"fixed.trace": [candidate1, candidate2]}
+
+        """
+        fix_search_para = {}
+        for key, value in self.search.items():
+            fix_search_para[fix_trace(key, possible_config)] = value
+        return search_lambda_eval(fix_search_para)
+
+    def link_config(self, config: Dict) -> Dict:
+        """inplace parser all the references in the config, the configs with the same structure reuse the same link plan
+
+        Args:
+            config: the expanded config
+
+        Returns:
+            linked config
+
+        """
+        fingerprint = self.ref_fingerprint(config)
+        if fingerprint in self.ref_plans:
+            return self.ref_plans[fingerprint].apply(config)
+
+        anchor_traces = []
+        self._collect_anchor_traces(config, [], anchor_traces)
+        ref_anchor_maps = {}
+        if self.root:
+            ref_anchor_maps = {"~": "_G", "_G": "_G"}
+        self.collect_global_anchors(
+            config,
+            ref_anchor_maps=ref_anchor_maps,
+            trace="",
+            root=True,
+        )
+        all_refs = self.collect_refs(
+            config,
+            config,
+            refs=[],
+            ref_anchor_maps=ref_anchor_maps,
+            trace="",
+            root=True,
+        )
+        plan = RefPlan(all_refs, anchor_traces)
+        if len(self.ref_plans) >= 128:
+            self.ref_plans.clear()
+        self.ref_plans[fingerprint] = plan
+        return self.do_parser_refs(plan.refs, config, plan.sorted_refs)
+
+    @classmethod
+    def ref_fingerprint(cls, config: Any) -> Any:
+        """get the structural fingerprint of the config, the configs have the same fingerprint will collect the same refs
+
+        Args:
+            config: the expanded config
+
+        Returns:
+            hashable fingerprint
+
+        """
+        if isinstance(config, dict):
+            return (
+                "dict",
+                tuple(
+                    (key, value if key == "_anchor" else cls.ref_fingerprint(value))
+                    for key, value in config.items()
+                ),
             )
+        elif isinstance(config, list):
+            return ("list", tuple(cls.ref_fingerprint(value) for value in config))
+        elif isinstance(config, str) and "@lambda" in config:
+            return config
+        return None
 
-        # link paras
-        if parser_ref:
-            ref_anchor_maps = {}
-            if self.root:
-                ref_anchor_maps = {"~": "_G", "_G": "_G"}
-            _all_possible_config_list = []
-            for possible_config in all_possible_config_list:
-                current_ref_anchor_maps = copy.deepcopy(ref_anchor_maps)
-                self.collect_global_anchors(
-                    possible_config,
-                    ref_anchor_maps=current_ref_anchor_maps,
-                    trace="",
-                    root=True,
-                )
-                all_refs = self.collect_refs(
-                    possible_config,
-                    possible_config,
-                    refs=[],
-                    ref_anchor_maps=current_ref_anchor_maps,
-                    trace="",
-                    root=True,
-                )
-                possible_config = self.do_parser_refs(all_refs, possible_config)
-                _all_possible_config_list.append(possible_config)
-            all_possible_config_list = _all_possible_config_list
+    @classmethod
+    def _collect_anchor_traces(cls, config: Any, trace: List, anchor_traces: List):
+        """collect the traces of all the dicts which contain `_anchor`"""
+        if isinstance(config, dict):
+            if "_anchor" in config:
+                anchor_traces.append(trace)
+            for key, value in config.items():
+                cls._collect_anchor_traces(value, trace + [key], anchor_traces)
+        elif isinstance(config, list):
+            for i, value in enumerate(config):
+                cls._collect_anchor_traces(value, trace + [i], anchor_traces)
+
+    def drop_root(self, config: Dict) -> Dict:
+        """drop the wrapped root of the config, only work for the root parser
 
-        return_list = copy.deepcopy(all_possible_config_list)
+        Args:
+            config: the expanded config
 
-        if self.is_rep_config(return_list):
-            for i, config in enumerate(return_list):
-                print(f"Found Repeat Configs")
-                print(f"The {i}th Configure is:")
-                print(json.dumps(config, indent=2, ensure_ascii=False))
-            raise ParserConfigRepeatError("REPEAT CONFIG")
+        Returns:
+            the config without the wrapped root
 
+        """
         if not self.root:
-            return return_list
-        drop_root_return_list = []
-        for config in return_list:
-            drop_root_config = config.pop("@__root__init__", {})
-            drop_root_config["_G"] = self._G
-            drop_root_return_list.append(drop_root_config)
-        return drop_root_return_list
+            return config
+        drop_root_config = dict(config.get("@__root__init__", {}))
+        drop_root_config["_G"] = self._G
+        return drop_root_config
 
     @classmethod
     def get_base_config(cls, module_type: str, module_name: str = "") -> Dict:
         """get the base config use the module_type
 
+        Args:
+            module_type: the config name
+
+        Returns:
+            config of the module_type
+        """
+        return copy.deepcopy(cls._get_cached_base_config(module_type, module_name))
+
+    @classmethod
+    def _get_cached_base_config(cls, module_type: str, module_name: str = "") -> Dict:
+        """get the resolved base config from the cache, the returned config is shared with the cache, it should not be modified inplace
+
         Args:
             module_type: the config name
 
@@ -258,6 +603,69 @@ class Parser(object):
             config of the module_type
         """
         module_type = module_type.split("#")[0].split("@")[0]
+        if _base_config_cache["version"] != ic_repo.version:
+            _base_config_cache["configs"] = {}
+            _base_config_cache["version"] = ic_repo.version
+        key = (module_type, module_name)
+        add_base_config_keys([key])
+        if key not in _base_config_cache["configs"]:
+            config = cls._resolve_base_config(module_type, module_name)
+            # the resolving may modify the ic_repo(e.g. load the submodules), and the cache will be expired
+            if _base_config_cache["version"] != ic_repo.version:
+                return config
+            _base_config_cache["configs"][key] = config
+        return _base_config_cache["configs"][key]
+
+    @classmethod
+    def base_config_digest(cls, module_type: str, module_name: str = "") -> str:
+        """get the digest of the resolved base config, it is changed once the base config or its bases are changed
+
+        Args:
+            module_type: the config name
+            module_name: the module name
+
+        Returns:
+            digest of the base config
+        """
+        return config_digest(cls._get_cached_base_config(module_type, module_name))
+
+    @staticmethod
+    def dump_base_config_cache() -> Dict:
+        """get the resolved base configs in the cache, which can be loaded by other process via `load_base_config_cache`
+
+        Returns:
+            {(module_type, module_name): resolved base config}
+        """
+        if _base_config_cache["version"] != ic_repo.version:
+            return {}
+        return dict(_base_config_cache["configs"])
+
+    @staticmethod
+    def load_base_config_cache(configs: Dict):
+        """load the resolved base configs to the cache, the loaded configs are valid until the ic_repo is changed
+
+        Args:
+            configs: {(module_type, module_name): resolved base config}
+
+        Returns:
+            None
+        """
+        if _base_config_cache["version"] != ic_repo.version:
+            _base_config_cache["configs"] = {}
+            _base_config_cache["version"] = ic_repo.version
+        _base_config_cache["configs"].update(configs)
+
+    @classmethod
+    def _resolve_base_config(cls, module_type: str, module_name: str = "") -> Dict:
+        """resolve the inheritance chain of the base config
+
+        Args:
+            module_type: the config name
+            module_name: the module name
+
+        Returns:
+            config of the module_type
+        """
         config = ic_repo.get((module_type, module_name), {})
         if config.get("_base", "") == "":
             return config
@@ -271,7 +679,7 @@ class Parser(object):
         return {}
 
     @staticmethod
-    def do_parser_refs(refs: List, config: Dict):
+    def do_parser_refs(refs: List, config: Dict, sorted_refs: Union[List, None] = None):
         """inplace parser ref on config
 
         Args:
@@ -289,6 +697,7 @@ class Parser(object):
                     }
                 ]
             config: will linked base config
+            sorted_refs: the result of `Parser.sort_refs(refs)`, the configs share the same link structure can reuse it
 
         Returns:
             None
@@ -299,26 +708,8 @@ class Parser(object):
         if not config:
             assert len(refs) == 0, f"the config is empty, but the refs is {refs}."
             return config
-        # TOPSORT
-        nodes = {}
-        for ref in refs:
-            if ref["key"] not in nodes:
-                nodes[ref["key"]] = {
-                    "parents": set(),
-                    "children": set(),
-                    "value": {"paras": ref["paras"], "lambda": ref["lambda"]},
-                }
-            else:
-                assert nodes[ref["key"]]["value"] == None
-                nodes[ref["key"]]["value"] = {
-                    "paras": ref["paras"],
-                    "lambda": ref["lambda"],
-                }
-            for para in ref["paras"]:
-                if para not in nodes:
-                    nodes[para] = {"parents": set(), "children": set(), "value": None}
-                nodes[ref["key"]]["parents"].add(para)
-                nodes[para]["children"].add(ref["key"])
+        if sorted_refs is None:
+            sorted_refs = Parser.sort_refs(refs)
 
         def _get_trace_value(trace: str):
             """get the value of trace in config"""
@@ -347,29 +738,16 @@ class Parser(object):
             """get the value of lambda_config"""
             _lambda_keys = lambda_config["paras"]
             _lambda_paras = [_node_value_map[key] for key in _lambda_keys]
-            return eval(lambda_config["lambda"])(*(_lambda_paras))
+            # the link lambdas see the namespace of this module
+            return compile_lambda(lambda_config["lambda"], __name__)(*(_lambda_paras))
 
         node_value_map = {}
 
-        while nodes:
-            circle_flag = True
-            for key, node in nodes.items():
-                if not node["parents"]:
-                    if not node["value"]:
-                        node_value_map[key] = _get_trace_value(key)
-                    else:
-                        node_value_map[key] = _get_lambda_value(
-                            node["value"], node_value_map
-                        )
-                    for child in node["children"]:
-                        nodes[child]["parents"].remove(key)
-                    nodes.pop(key)
-                    circle_flag = False
-                    break
-            if circle_flag:
-                raise PermissionError(
-                    f"The config link has circle, please check:\n{json.dumps(refs, indent=4)}"
-                )
+        for key, value in sorted_refs:
+            if not value:
+                node_value_map[key] = _get_trace_value(key)
+            else:
+                node_value_map[key] = _get_lambda_value(value, node_value_map)
 
         def _set_trace_value(trace: str, value):
             """set the value of trace in config"""
@@ -402,6 +780,74 @@ class Parser(object):
             _set_trace_value(key, value)
         return config
 
+    @staticmethod
+    def sort_refs(refs: List) -> List:
+        """topological sort the refs(Kahn's algorithm), every node is visited only once
+
+        Args:
+            refs: the refs collected by `Parser.collect_refs`
+
+        Returns:
+            the sorted nodes, the lambda value of the pure reference node(not a link) is None
+            [
+                ("root.module.module.config.key2", None),
+                ("root.module.module.config.key", {"paras": ["root.module.module.config.key2"], "lambda": "lambda x: x"}),
+            ]
+
+        Raises:
+            PermissionError: the link has circle
+
+        """
+        nodes = {}
+        for ref in refs:
+            if ref["key"] not in nodes:
+                nodes[ref["key"]] = {
+                    "parents": set(),
+                    "children": [],
+                    "value": {"paras": ref["paras"], "lambda": ref["lambda"]},
+                }
+            else:
+                assert nodes[ref["key"]]["value"] == None
+                nodes[ref["key"]]["value"] = {
+                    "paras": ref["paras"],
+                    "lambda": ref["lambda"],
+                }
+            for para in ref["paras"]:
+                if para not in nodes:
+                    nodes[para] = {"parents": set(), "children": [], "value": None}
+                if para not in nodes[ref["key"]]["parents"]:
+                    nodes[ref["key"]]["parents"].add(para)
+                    nodes[para]["children"].append(ref["key"])
+
+        in_degree = {key: len(node["parents"]) for key, node in nodes.items()}
+        queue = collections.deque(key for key in nodes if not in_degree[key])
+        sorted_refs = []
+        while queue:
+            key = queue.popleft()
+            sorted_refs.append((key, nodes[key]["value"]))
+            for child in nodes[key]["children"]:
+                in_degree[child] -= 1
+                if not in_degree[child]:
+                    queue.append(child)
+
+        if len(sorted_refs) != len(nodes):
+            # all the remain nodes are in or depend on a circle, walk up the parents until meet a visited node
+            remain = {key for key in nodes if in_degree[key]}
+            path = [next(key for key in nodes if key in remain)]
+            visited = {path[0]: 0}
+            while True:
+                parent = next(p for p in nodes[path[-1]]["parents"] if p in remain)
+                if parent in visited:
+                    circle = path[visited[parent] :] + [parent]
+                    break
+                visited[parent] = len(path)
+                path.append(parent)
+            circle = circle[::-1]
+            raise PermissionError(
+                f"The config link has circle: {' -> '.join(circle)}, please check:\n{json.dumps(refs, indent=4)}"
+            )
+        return sorted_refs
+
     @classmethod
     def collect_global_anchors(
         cls,
@@ -495,7 +941,7 @@ class Parser(object):
                 >>>     }
                 >>> }
             ref_anchor_maps:
-                global anchor path map and the relative anchor path map
+                global anchor path map and the relative anchor path map, a new scope(collections.ChainMap.new_child) is pushed for each module which has `_anchor`, so the maps are not copied for each node
             trace:
                 the trace from root to current node
             key:
@@ -512,6 +958,8 @@ class Parser(object):
             ]
 
         """
+        if not isinstance(ref_anchor_maps, collections.ChainMap):
+            ref_anchor_maps = collections.ChainMap(ref_anchor_maps)
         if isinstance(cur_config, str):
             try:
                 lambda_info = parser_lambda_key_value_pair(
@@ -530,7 +978,7 @@ class Parser(object):
                     cur_config=config_i,
                     root_config=root_config,
                     refs=refs,
-                    ref_anchor_maps=copy.deepcopy(ref_anchor_maps),
+                    ref_anchor_maps=ref_anchor_maps,
                     trace=f"{trace}.{i}",
                     deep=deep,
                 )
@@ -542,6 +990,8 @@ class Parser(object):
                 anchor_addable = False or root
             if "_anchor" in cur_config:
                 assert anchor_addable, f"{key} is not a module, but found .name in it."
+                # the relative anchors only visible in current module scope
+                ref_anchor_maps = ref_anchor_maps.new_child()
                 for d in range(deep, 0, -1):
                     if "$" * d in ref_anchor_maps:
                         ref_anchor_maps["$" * (d + 1)] = ref_anchor_maps["$" * d]
@@ -557,7 +1007,7 @@ class Parser(object):
                     cur_config=submodule_config,
                     root_config=root_config,
                     refs=refs,
-                    ref_anchor_maps=copy.deepcopy(ref_anchor_maps),
+                    ref_anchor_maps=ref_anchor_maps,
                     trace=cur_trace,
                     key=submodule_name,
                     deep=deep + 1,
@@ -607,6 +1057,8 @@ class Parser(object):
             ]
 
         """
+        if not isinstance(ref_anchor_maps, collections.ChainMap):
+            ref_anchor_maps = collections.ChainMap(ref_anchor_maps)
         if isinstance(cur_config, str):
             lambda_info = parser_lambda_key_value_pair(
                 trace, cur_config, ref_anchor_maps, root_config
@@ -620,7 +1072,7 @@ class Parser(object):
                     cur_config=config_i,
                     root_config=root_config,
                     refs=refs,
-                    ref_anchor_maps=copy.deepcopy(ref_anchor_maps),
+                    ref_anchor_maps=ref_anchor_maps,
                     trace=f"{trace}.{i}",
                     anchor_addable=False,
                     deep=deep,
@@ -631,6 +1083,8 @@ class Parser(object):
                 anchor_addable or "_anchor" not in cur_config
             ), f"_anchor is not addable in {trace}"
             if anchor_addable and "_anchor" in cur_config:
+                # the relative anchors only visible in current module scope
+                ref_anchor_maps = ref_anchor_maps.new_child()
                 _anchor = cur_config["_anchor"]
                 if _anchor != "$":
                     ref_anchor_maps[_anchor] = trace
@@ -648,7 +1102,7 @@ class Parser(object):
                     cur_config=submodule_config,
                     root_config=root_config,
                     refs=refs,
-                    ref_anchor_maps=copy.deepcopy(ref_anchor_maps),
+                    ref_anchor_maps=ref_anchor_maps,
                     trace=submodule_name,
                     anchor_addable=anchor_addable,
                     deep=deep + 1,
@@ -668,6 +1122,41 @@ class Parser(object):
 
         Returns: parserd config (whole config) of abstract_config
 
+        """
+        return [
+            config
+            for config, _ in self._get_kind_module_expansions(
+                abstract_config, module_type
+            )
+        ]
+
+    def _get_kind_module_expansions(
+        self, abstract_config: Union[dict, str], module_type: str = ""
+    ) -> Iterator[Tuple[Any, Dict]]:
+        """the lazy version of `get_kind_module_base_config`, and the search paras produced each config are also yielded
+
+        Yields: config, and the search paras({"fixed.trace": (candidate index, value)})
+
+        """
+        module_parser = self.get_kind_module_parser(abstract_config, module_type)
+        if isinstance(module_parser, Parser):
+            for config, axes in module_parser._iter_expand():
+                yield module_parser.drop_root(config), axes
+        else:
+            for config in module_parser:
+                yield config, {}
+
+    def get_kind_module_parser(
+        self, abstract_config: Union[dict, str], module_type: str = ""
+    ) -> Union["Parser", List]:
+        """get the parser of 'module_type' by given abstract_config
+
+        Args:
+            abstract_config: will expanded config
+            module_type: the module kind, like 'embedding', 'subprocessor', which registered in config_parser_register
+
+        Returns: the Parser of the submodule, or the only possible value list if abstract_config is not a module
+
         """
         if module_type in self.reserved:
             return [abstract_config]
@@ -679,11 +1168,9 @@ class Parser(object):
                     return [MISSING]
                 return Parser(
                     raw_config={"_base": abstract_config}, module_type=module_type
-                ).parser(parser_ref=False)
+                )
             if isinstance(abstract_config, dict):
-                return Parser(
-                    raw_config=abstract_config, module_type=module_type
-                ).parser(parser_ref=False)
+                return Parser(raw_config=abstract_config, module_type=module_type)
             else:
                 raise ValueError(
                     f"module {module_type} should be a dict, but got {abstract_config}"
@@ -705,24 +1192,79 @@ class Parser(object):
         Returns: list of possible config
 
         """
-        result = []
+        return list(cls.iter_flat_search(search, config, module_type))
+
+    @classmethod
+    def iter_flat_search(cls, search, config: dict, module_type) -> Iterator[dict]:
+        """the lazy version of `flat_search`, yield the possible config one by one
+
+        Args:
+            search: search paras, {"para1": [1,2,3], 'para2': 'list(range(10))'}
+            config: base config
+
+        Yields: possible config
+
+        """
+        for search_config, _ in cls._iter_flat_search(search, config, module_type):
+            yield search_config
+
+    @classmethod
+    def _iter_flat_search(
+        cls, search, config: dict, module_type
+    ) -> Iterator[Tuple[dict, Dict]]:
+        """the same as `iter_flat_search`, but the search paras produced each config are also yielded
+
+        Yields: possible config, and the search paras({"fixed.trace": (candidate index, value)})
+
+        """
         module_search_para = search
         if not module_search_para:
-            result.append(config)
-        else:
-            search_para_list = cls.get_named_list_cartesian_prod(module_search_para)
-            for search_para in search_para_list:
-                base_config = copy.deepcopy(config)
-                keys = list(search_para.keys())
-                keys.sort()
-                for key in keys:
-                    current = base_config
-                    for sub_key in split_trace(key)[:-1]:
-                        current = base_config[sub_key]
-                    current[split_trace(key)[-1]] = search_para[key]
-                extend_config = cls(base_config, module_type).parser(parser_ref=False)
-                result.extend(extend_config)
-        return result
+            yield config, {}
+            return
+        # the candidate index is kept with the value, the equal candidates can be told apart in the repeat report
+        indexed_search_para = {
+            key: (
+                list(enumerate(candidates))
+                if isinstance(candidates, list)
+                else candidates
+            )
+            for key, candidates in module_search_para.items()
+        }
+        for search_axes in cls.iter_named_list_cartesian_prod(indexed_search_para):
+            search_para = {key: value for key, (_, value) in search_axes.items()}
+            base_config = cls.update_search_para(config, search_para)
+            search_parser = cls(base_config, module_type)
+            for search_config, axes in search_parser._iter_expand():
+                yield search_parser.drop_root(search_config), {**search_axes, **axes}
+
+    @staticmethod
+    def update_search_para(config: Dict, search_para: Dict) -> Dict:
+        """set one combination of the search paras to the copy of the config, only the dicts(lists) on the path of the search keys are copied, the other subtrees are shared with the config
+
+        Args:
+            config: base config
+            search_para: one combination of the search paras, {"fixed.trace": value}
+
+        Returns:
+            the updated config
+
+        """
+        base_config = copy.copy(config)
+        keys = list(search_para.keys())
+        keys.sort()
+        for key in keys:
+            current = base_config
+            trace_list = split_trace(key)
+            for sub_key in trace_list[:-1]:
+                if isinstance(current, list):
+                    sub_key = int(sub_key)
+                current[sub_key] = copy.copy(current[sub_key])
+                current = current[sub_key]
+            trace_last = trace_list[-1]
+            if isinstance(current, list):
+                trace_last = int(trace_last)
+            current[trace_last] = search_para[key]
+        return base_config
 
     def get_cartesian_prod(
         self, list_of_list_of_dict: List[List[Dict]]
@@ -738,13 +1280,11 @@ class Parser(object):
         """
         if len(list_of_list_of_dict) <= 1:
             return [copy.deepcopy(dic) for dic in list_of_list_of_dict]
-        cur_result = list_of_list_of_dict[0]
-        reserve_result = self.get_cartesian_prod(list_of_list_of_dict[1:])
-        result = []
-        for cur_config in cur_result:
-            for reserve in reserve_result:
-                result.append([copy.deepcopy(cur_config)] + copy.deepcopy(reserve))
-        return result
+        # only copy once for each result, the combination is shared before copy
+        return [
+            copy.deepcopy(list(combination))
+            for combination in itertools.product(*list_of_list_of_dict)
+        ]
 
     @staticmethod
     def check_config(configs: Union[Dict, List[Dict]]) -> None:
@@ -789,29 +1329,89 @@ class Parser(object):
         Returns:
             [{'name1': 1, 'name2': 1}, {'name1': 1, 'name2': 2}, {'name1': 1, 'name2': 3}, ...]
 
+        """
+        # only copy once for each result, the combination is shared before copy
+        return [
+            copy.deepcopy(combination)
+            for combination in Parser.iter_named_list_cartesian_prod(dict_of_list)
+        ]
+
+    @staticmethod
+    def iter_named_list_cartesian_prod(dict_of_list: Dict[str, List]) -> Iterator[Dict]:
+        """the lazy version of `get_named_list_cartesian_prod`, the order of the yielded configs is the same as `get_named_list_cartesian_prod`
+
+        NOTE: the values are not copied, they are shared between the yielded combinations, so you should not modify them inplace.
+
+        Args:
+            dict_of_list: {'name1': [1,2,3], 'name2': [1,2,3,4]}
+
+        Yields:
+            {'name1': 1, 'name2': 1}, {'name1': 2, 'name2': 1}, {'name1': 3, 'name2': 1}, ...
+
         """
         if not dict_of_list:
-            dict_of_list = {}
-        if len(dict_of_list) == 0:
-            return []
-        dict_of_list = copy.deepcopy(dict_of_list)
-        cur_name, cur_paras = dict_of_list.popitem()
-        cur_para_search_list = []
-        assert isinstance(
-            cur_paras, list
-        ), f"The search candidates must be list, but you provide {cur_paras}({type(cur_paras)})"
-        for para in cur_paras:
-            cur_para_search_list.append({cur_name: para})
-        if len(dict_of_list) == 0:
-            return cur_para_search_list
-        reserve_para_list = Parser.get_named_list_cartesian_prod(dict_of_list)
-        all_config_list = []
-        for cur_config in cur_para_search_list:
-            for reserve_config in reserve_para_list:
-                _cur_config = copy.deepcopy(cur_config)
-                _cur_config.update(copy.deepcopy(reserve_config))
-                all_config_list.append(_cur_config)
-        return all_config_list
+            return
+        # the last name changes slowest, keep the same order as the `get_named_list_cartesian_prod`
+        names = list(dict_of_list.keys())[::-1]
+        for name in names:
+            assert isinstance(
+                dict_of_list[name], list
+            ), f"The search candidates must be list, but you provide {dict_of_list[name]}({type(dict_of_list[name])})"
+        for values in itertools.product(*[dict_of_list[name] for name in names]):
+            yield dict(zip(names, values))
+
+    @staticmethod
+    def iter_lazy_named_cartesian_prod(
+        dict_of_iterable: Dict[str, Iterable],
+    ) -> Iterator[Dict]:
+        """the same as `iter_named_list_cartesian_prod`, but the candidates are pulled from the iterables on demand
+
+        The last name changes slowest, so its candidates are iterated only once. The other iterables are iterated again for every candidate of the slower names, their candidates are kept only if some slower name has more than one candidate, so a single big axis(like the root module) is streamed without keeping the candidates.
+
+        NOTE: the values are not copied, they are shared between the yielded combinations, so you should not modify them inplace.
+
+        Args:
+            dict_of_iterable: {'name1': iterable1, 'name2': iterable2}
+
+        Yields:
+            {'name2': value2, 'name1': value1}, the key order is the same as `iter_named_list_cartesian_prod`
+
+        """
+        if not dict_of_iterable:
+            return
+        names = list(dict_of_iterable.keys())
+        axes = [ReIterable(dict_of_iterable[name]) for name in names]
+        for i in range(len(axes) - 1, 0, -1):
+            if axes[i].peek(2) > 1:
+                for axis in axes[:i]:
+                    axis.cache = True
+                break
+
+        def _prod(i: int) -> Iterator[Tuple]:
+            """the combinations of the axes[i], axes[i-1], ..., axes[0]"""
+            if i < 0:
+                yield ()
+                return
+            for value in axes[i]:
+                for values in _prod(i - 1):
+                    yield (value,) + values
+
+        reversed_names = names[::-1]
+        for values in _prod(len(axes) - 1):
+            yield dict(zip(reversed_names, values))
+
+    @staticmethod
+    def config_digest(config: Dict) -> str:
+        """get the digest of the config, the same config always has the same digest
+
+        Args:
+            config: the config
+
+        Returns:
+            digest of the config
+
+        """
+        return config_digest(config)
 
     def is_rep_config(self, list_of_dict: List[dict]) -> bool:
         """check is there a repeat config in list
@@ -823,11 +1423,10 @@ class Parser(object):
             has repeat or not
 
         """
-        # using json.dumps + sort_keys to guarantee the same dict to the same string represatation
-        list_of_str = [
-            json.dumps(dic, sort_keys=True, ensure_ascii=False) for dic in list_of_dict
-        ]
-        if len(list_of_dict) == len(set(list_of_str)):
-            return False
-        else:
-            return True
+        digests = set()
+        for dic in list_of_dict:
+            digest = self.config_digest(dic)
+            if digest in digests:
+                return True
+            digests.add(digest)
+        return False
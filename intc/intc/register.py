@@ -3,8 +3,10 @@
 # This source code is licensed under the Apache license found in the
 # LICENSE file in the root directory of this source tree.
 
+import importlib.metadata
 import inspect
-from typing import Any, Callable, Dict, Type, TypeVar
+import json
+from typing import Any, Callable, Dict, Type, TypeVar, Union
 
 from attrs import asdict, define, field, fields, fields_dict
 
@@ -15,11 +17,13 @@ from intc.exceptions import (
     NoModuleFoundError,
     RepeatRegisterError,
 )
-from intc.share import get_registed_instance, registry
-from intc.utils import module_name_check
+from intc.share import get_registed_instance, import_registed_module, registry
+from intc.utils import Lazy, LazyAttribute, LazyDict, VersionedDict, module_name_check
 
-ic_repo = {}
-ic_help = {}
+# the ic_repo.version is increased on every modification, the parser base config cache depends on it
+# the entries of ic_repo and ic_help of the registered modules are computed on the first access
+ic_repo = VersionedDict()
+ic_help = LazyDict()
 type_module_map = {}
 
 SpecificConfig = TypeVar("SpecificConfig")
@@ -54,12 +58,17 @@ class Register(object):
             },
         }
 
-    def register(self, type_name: str = "", name: str = "") -> Callable:
+    def register(
+        self, type_name: str = "", name: str = "", frozen: bool = False
+    ) -> Callable:
         """register the named module, you can only provide the type name, or type name and module name
 
+        the instances of the module are always slotted(without the per-instance `__dict__`)
+
         Args:
             type_name: the type name
             name: the specific module name in the type
+            frozen: whether the instances are immutable, assigning to the parameters raises `attrs.exceptions.FrozenInstanceError`
 
         Returns:
             the module
@@ -141,7 +150,12 @@ class Register(object):
         def decorator(module) -> Base:
             if not skip_regist and type_name not in registry:
                 registry[type_name] = {}
-            if not skip_regist and name in registry[type_name]:
+            # the import path placeholder(like loaded from the snapshot) is replaced by the real module
+            if (
+                not skip_regist
+                and name in registry[type_name]
+                and not isinstance(registry[type_name][name], str)
+            ):
                 raise RepeatRegisterError(
                     f"The {name} is already registered in {type_name}. Registed: {registry[type_name][name]}"
                 )
@@ -149,28 +163,134 @@ class Register(object):
             module_doc = module.__doc__
             if module.__bases__ == (object,):
                 module = type(module.__name__, (Base,), dict(module.__dict__))
-            wrap_module = define(module)
-
-            field_help = get_help(wrap_module)
-            field_help["properties"] = field_help.get("properties", {})
-            for built_in in self.built_in_field:
-                field_help["properties"][built_in] = self.built_in_field[built_in]
-            field_help["_name"] = name
-            field_help["description"] = (
-                module_doc if module_doc else "No Module Document"
-            )
-            wrap_module.__meta__ = field_help
+            wrap_module = define(module, frozen=frozen)
+
+            def get_field_help():
+                # reading the source and building the help is slow, only do it when the help is used
+                field_help = get_help(wrap_module)
+                field_help["properties"] = field_help.get("properties", {})
+                for built_in in self.built_in_field:
+                    field_help["properties"][built_in] = self.built_in_field[built_in]
+                field_help["_name"] = name
+                field_help["description"] = (
+                    module_doc if module_doc else "No Module Document"
+                )
+                return field_help
+
+            field_help = Lazy(get_field_help)
+            wrap_module.__meta__ = LazyAttribute(field_help)
             if not skip_regist:
                 registry[type_name][name] = wrap_module
                 ic_help[(type_name, name)] = field_help
                 type_modules = type_module_map.get(type_name, set())
                 type_modules.add(name)
                 type_module_map[type_name] = type_modules
-                ic_repo[(type_name, name)] = wrap_module()._to_dict(lazy=True)
+                ic_repo[(type_name, name)] = Lazy(
+                    lambda: wrap_module()._to_dict(lazy=True)
+                )
             return wrap_module
 
         return decorator
 
+    def register_lazy(self, type_name: str, name: str, import_path: str):
+        """register the module by the import path, the package is imported on the first use of the module or its config/help
+
+        Args:
+            type_name: the type name
+            name: the specific module name in the type
+            import_path: like "package.module:Class"
+
+        Returns:
+            None
+
+        """
+        module_name_check(type_name)
+        module_name_check(name)
+        assert (
+            ":" in import_path
+        ), f"The import path should be like 'package.module:Class', but got '{import_path}'"
+        if type_name not in registry:
+            registry[type_name] = {}
+        if name in registry[type_name]:
+            raise RepeatRegisterError(
+                f"The {name} is already registered in {type_name}. Registed: {registry[type_name][name]}"
+            )
+        registry[type_name][name] = import_path
+        type_modules = type_module_map.get(type_name, set())
+        type_modules.add(name)
+        type_module_map[type_name] = type_modules
+        ic_repo[(type_name, name)] = self._lazy_import_entry(
+            ic_repo, type_name, name, lambda module: module()._to_dict(lazy=True)
+        )
+        ic_help[(type_name, name)] = self._lazy_import_entry(
+            ic_help, type_name, name, lambda module: module.__meta__
+        )
+
+    @staticmethod
+    def _lazy_import_entry(
+        repo: LazyDict, type_name: str, name: str, get_entry: Callable
+    ) -> Lazy:
+        """the placeholder of the lazy registered module in ic_repo/ic_help, importing the package replaces it by the real entry
+
+        Args:
+            repo: ic_repo or ic_help
+            type_name: the type name
+            name: the module name
+            get_entry: get the entry from the module if the importing does not register it
+
+        Returns:
+            the placeholder
+        """
+        key = (type_name, name)
+
+        def _import():
+            module = import_registed_module(type_name, name)
+            if dict.__getitem__(repo, key) is placeholder:
+                return get_entry(module)
+            return repo[key]
+
+        placeholder = Lazy(_import)
+        return placeholder
+
+    def load_manifest(self, manifest: Union[str, Dict[str, Dict[str, str]]]):
+        """register the modules in the manifest lazily
+
+        Args:
+            manifest: the manifest file path(json) or dict, like {"type_name": {"name": "package.module:Class"}}
+
+        Returns:
+            None
+
+        """
+        if isinstance(manifest, str):
+            with open(manifest, "r") as f:
+                manifest = json.load(f)
+        for type_name, modules in manifest.items():
+            for name, import_path in modules.items():
+                self.register_lazy(type_name, name, import_path)
+
+    def load_entry_points(self, group: str = "intc"):
+        """register the modules declared in the entry points of the installed packages lazily, the entry point name is "type_name@name", like
+
+        [project.entry-points.intc]
+        "model@bert" = "my_package.models:BertConfig"
+
+        Args:
+            group: the entry point group
+
+        Returns:
+            None
+
+        """
+        entry_points = importlib.metadata.entry_points()
+        if hasattr(entry_points, "select"):
+            entry_points = entry_points.select(group=group)
+        else:
+            entry_points = entry_points.get(group, [])
+        for entry_point in entry_points:
+            type_name, _, name = entry_point.name.partition("@")
+            self.register_lazy(type_name, name, entry_point.value)
+
     def get(self, type_name: str, name: str = "", get_class=False) -> Any:
         """get the module by name
 
@@ -186,11 +306,11 @@ class Register(object):
         return get_registed_instance(type_name, name, get_class)
 
     def __call__(
-        self, type_name: str = "", name: str = ""
+        self, type_name: str = "", name: str = "", frozen: bool = False
     ) -> Callable[[Type[SpecificConfig]], Type[SpecificConfig]]:
         """you can directly call the object, the behavior is the same as object.register(name)"""
 
-        return self.register(type_name, name)
+        return self.register(type_name, name, frozen)
 
     def __getitem__(self, type_and_name: tuple) -> Any:
         """wrap for object.get(name)"""
@@ -0,0 +1,370 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+import bisect
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+from intc.parser import Parser, add_base_config_keys, record_base_config_keys
+
+# the state of the worker process of `parallel_parser`, set by `_init_worker`
+_worker_state: Dict = {}
+
+# the keys make a searched dict be expanded by the `Parser`
+_EXPAND_KEYS = {"_search", "_base", "_name"}
+
+
+def _can_expand(value: Any) -> bool:
+    """check whether the searched value may be expanded to more than one config, only the dict(or the list of dicts) contains `_search`, `_base`, `_name` or the submodule(`@` prefixed) keys can be expanded
+
+    Args:
+        value: the searched value
+
+    Returns:
+        False means the value is expanded to exactly one config
+    """
+    if isinstance(value, dict):
+        return any(
+            key in _EXPAND_KEYS
+            or (isinstance(key, str) and key.startswith("@"))
+            or _can_expand(sub_value)
+            for key, sub_value in value.items()
+        )
+    if isinstance(value, list):
+        return any(_can_expand(sub_value) for sub_value in value)
+    return False
+
+
+class SearchSpace(object):
+    """Index-addressable view of all the configs expanded by a `Parser`
+
+    The i-th config is decoded directly from the mixed-radix representation of `i` over the submodule choices and the `_search` axes, so a worker only need to build the configs it really uses. The order of the configs is the same as `Parser.parser()`.
+
+    NOTE: the repeat config check of `Parser.parser()` is not applied, because it needs enumerate the whole space.
+
+    """
+
+    def __init__(self, parser: Parser, parser_ref=True):
+        """
+        Args:
+            parser: the parser of the config
+            parser_ref: whether parser the links of the decoded config
+        """
+        super(SearchSpace, self).__init__()
+        self.parser = parser
+        self.parser_ref = parser_ref
+
+        # the submodule axes, the first key changes fastest and the last key changes slowest, the same as `Parser.get_named_list_cartesian_prod`
+        self.module_axes: Dict[str, Union[SearchSpace, List]] = {}
+        for module_type in parser.raw_config:
+            module_parser = parser.get_kind_module_parser(
+                parser.raw_config[module_type], module_type
+            )
+            if isinstance(module_parser, Parser):
+                self.module_axes[module_type] = SearchSpace(
+                    module_parser, parser_ref=False
+                )
+            else:
+                self.module_axes[module_type] = module_parser
+        # the sizes of the submodule axes and the offsets are computed on the first use, so the space can be split to the workers without expanding it
+        self._module_size: Union[int, None] = None
+        self._offsets: Union[List[int], None] = None
+
+        # the candidates of the search axes are not related to the submodule choices, only the search keys should be fixed for each choice
+        self.search = {}
+        if parser.search and self.module_size:
+            self.search = parser.get_search_para(self._get_module_config(0))
+        self.search_size = 1
+        for candidates in self.search.values():
+            assert isinstance(
+                candidates, list
+            ), f"The search candidates must be list, but you provide {candidates}({type(candidates)})"
+            self.search_size *= len(candidates)
+
+        # if the searched values can not be expanded(like the scalars, lists and the plain dicts), every search combination is expanded to exactly one config, otherwise we should count the expanded configs of each combination
+        self.expandable = any(
+            _can_expand(candidate)
+            for candidates in self.search.values()
+            for candidate in candidates
+        )
+
+    @property
+    def module_size(self) -> int:
+        """the number of the submodule choices"""
+        if self._module_size is None:
+            module_size = 1 if self.module_axes else 0
+            for axis in self.module_axes.values():
+                module_size *= len(axis)
+            self._module_size = module_size
+        return self._module_size
+
+    @property
+    def outer_size(self) -> int:
+        """the number of the (submodule choice, search combination) pairs, every pair is expanded to one or more(if the space is expandable) configs"""
+        return self.module_size * self.search_size
+
+    @property
+    def offsets(self) -> List[int]:
+        """the cumulative number of the configs expanded by the outer combinations, empty if the space is not expandable"""
+        if self._offsets is None:
+            self._offsets = []
+            if self.expandable:
+                total = 0
+                for index in range(self.outer_size):
+                    total += len(
+                        self._get_search_space(*divmod(index, self.search_size))
+                    )
+                    self._offsets.append(total)
+        return self._offsets
+
+    @property
+    def size(self) -> int:
+        """the number of the configs"""
+        if not self.expandable:
+            return self.outer_size
+        return self.offsets[-1] if self.offsets else 0
+
+    @staticmethod
+    def _decode_named_prod(
+        dict_of_axis: Dict[str, Union["SearchSpace", List]], index: int
+    ) -> Dict:
+        """decode the index to one combination of the named axes, the first name changes fastest
+
+        Args:
+            dict_of_axis: {'name1': [1,2,3], 'name2': SearchSpace}
+            index: the index of the combination
+
+        Returns:
+            the combination, the key order is the same as `Parser.get_named_list_cartesian_prod`
+        """
+        values = {}
+        for name, axis in dict_of_axis.items():
+            index, digit = divmod(index, len(axis))
+            if isinstance(axis, SearchSpace):
+                values[name] = axis[digit]
+            else:
+                values[name] = copy.deepcopy(axis[digit])
+        return {name: values[name] for name in list(dict_of_axis.keys())[::-1]}
+
+    def _get_module_config(self, module_index: int) -> Dict:
+        """get the combined module config by the index of the submodule choices"""
+        return self._decode_named_prod(self.module_axes, module_index)
+
+    def _get_search_config(
+        self, module_index: int, search_index: int
+    ) -> Tuple[Dict, Dict]:
+        """get the combined module config and the search paras updated config"""
+        possible_config = self._get_module_config(module_index)
+        search = self.parser.get_search_para(possible_config)
+        if not search:
+            return possible_config, {}
+        search_para = self._decode_named_prod(search, search_index)
+        return possible_config, Parser.update_search_para(possible_config, search_para)
+
+    def _get_search_space(
+        self, module_index: int, search_index: int
+    ) -> Union["SearchSpace", List]:
+        """get the expanded space of one search combination"""
+        possible_config, base_config = self._get_search_config(
+            module_index, search_index
+        )
+        if not base_config:
+            return [possible_config]
+        return SearchSpace(
+            Parser(base_config, self.parser.module_type), parser_ref=False
+        )
+
+    def _get_inner_space(self, outer_index: int) -> Union["SearchSpace", List]:
+        """get the expanded space of the outer combination, and check the space which is not expandable is expanded to only one config"""
+        inner_space = self._get_search_space(*divmod(outer_index, self.search_size))
+        if not self.expandable and len(inner_space) != 1:
+            raise ValueError(
+                f"The search combination {outer_index} is expanded to {len(inner_space)} configs, but the search value which can not be expanded should be expanded to only one config."
+            )
+        return inner_space
+
+    def _finish(self, config: Dict) -> Dict:
+        """link(if parser_ref) and drop the root of the expanded config"""
+        if self.parser_ref:
+            config = self.parser.link_config(config)
+        return self.parser.drop_root(config)
+
+    def _decode(self, index: int) -> Dict:
+        """decode the index to the config"""
+        if self.expandable:
+            outer_index = bisect.bisect_right(self.offsets, index)
+            inner_index = index - (self.offsets[outer_index - 1] if outer_index else 0)
+        else:
+            outer_index, inner_index = index, 0
+        return self._finish(self._get_inner_space(outer_index)[inner_index])
+
+    def iter_outer(self, start: int, stop: int) -> Iterator[Dict]:
+        """yield the configs expanded by the outer combinations in [start, stop), the configs of each combination are expanded by iterating, so the offsets are not needed
+
+        Args:
+            start: the first outer index
+            stop: the stop outer index(not included)
+
+        Yields:
+            config, in the same order as `Parser.parser()`
+        """
+        for outer_index in range(start, min(stop, self.outer_size)):
+            for config in self._get_inner_space(outer_index):
+                yield self._finish(config)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict, List[Dict]]:
+        """get the index-th config, or a list of configs for slice
+
+        Args:
+            index: the index or slice
+
+        Returns:
+            config or configs list
+        """
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(self.size)[index]]
+        if index < 0:
+            index += self.size
+        if index < 0 or index >= self.size:
+            raise IndexError(
+                f"SearchSpace index out of range, the size of the space is {self.size}"
+            )
+        return self._decode(index)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.iter_outer(0, self.outer_size)
+
+    def shard(self, rank: int, world_size: int) -> Iterator[Dict]:
+        """yield the configs belong to the rank, the configs are assigned to the ranks in round robin
+
+        Args:
+            rank: the rank of current worker, in [0, world_size)
+            world_size: the number of workers
+
+        Yields:
+            config of the rank
+        """
+        assert world_size > 0, f"world_size must be positive, but got {world_size}"
+        assert (
+            0 <= rank < world_size
+        ), f"rank must be in [0, {world_size}), but got {rank}"
+        for index in range(rank, self.size, world_size):
+            yield self._decode(index)
+
+
+def _split_space(
+    space: SearchSpace,
+) -> Tuple[SearchSpace, List[Tuple[SearchSpace, str, Dict]]]:
+    """find the space whose outer combinations are split to the workers, descend from the root space while there are no search axes and only one submodule axis has more than one choice(like the `@__root__init__`)
+
+    Args:
+        space: the root space
+
+    Returns:
+        the space to split, and the (parent space, submodule name, the fixed choices of the other submodules) from the root to the space
+    """
+    path = []
+    while not space.search and space.module_axes:
+        name = max(
+            space.module_axes,
+            key=lambda key: (
+                space.module_axes[key].outer_size
+                if isinstance(space.module_axes[key], SearchSpace)
+                else len(space.module_axes[key])
+            ),
+        )
+        if not isinstance(space.module_axes[name], SearchSpace) or any(
+            len(axis) != 1 for key, axis in space.module_axes.items() if key != name
+        ):
+            break
+        fixed = {key: axis[0] for key, axis in space.module_axes.items() if key != name}
+        path.append((space, name, fixed))
+        space = space.module_axes[name]
+    return space, path
+
+
+def _wrap(config: Dict, path: List[Tuple[SearchSpace, str, Dict]]) -> Dict:
+    """wrap the config expanded by the split space to the config of the root space"""
+    for space, name, fixed in reversed(path):
+        values = copy.deepcopy(fixed)
+        values[name] = config
+        config = space._finish(
+            {key: values[key] for key in list(space.module_axes.keys())[::-1]}
+        )
+    return config
+
+
+def _init_worker(
+    space: SearchSpace,
+    path: List[Tuple[SearchSpace, str, Dict]],
+    base_configs: Dict,
+    check: bool,
+):
+    """init the worker process of `parallel_parser`, the resolved base configs are loaded so the worker need not resolve them from the ic_repo again"""
+    Parser.load_base_config_cache(base_configs)
+    _worker_state["space"] = space
+    _worker_state["path"] = path
+    _worker_state["check"] = check
+
+
+def _decode_range(start: int, stop: int) -> Tuple[List[Dict], set]:
+    """expand the outer combinations in [start, stop) of the split space in the worker process, the used base config keys are also returned"""
+    space, path = _worker_state["space"], _worker_state["path"]
+    with record_base_config_keys() as keys:
+        configs = [_wrap(config, path) for config in space.iter_outer(start, stop)]
+    if _worker_state["check"]:
+        Parser.check_config(configs)
+    return configs, keys
+
+
+def parallel_parser(
+    parser: Parser, parser_ref=True, check=False, workers: int = 2
+) -> List[Dict]:
+    """parser the config in `workers` processes, the outer combinations(the submodule choices x the search combinations) of the `SearchSpace` are split to contiguous ranges, every worker expands(and counts) the configs of its ranges, so the parent process never enumerates the space. The configs are returned in the same order as `Parser.parser()`
+
+    Args:
+        parser: the parser of the config
+        parser_ref: whether parser the links
+        check: whether check the configs in the worker processes
+        workers: the number of the worker processes
+
+    Returns:
+        all valided configs
+
+    """
+    space, path = _split_space(SearchSpace(parser, parser_ref=parser_ref))
+    size = space.outer_size
+    if not size:
+        return []
+    # expand the first outer combination to resolve the base configs which will be shipped to the workers
+    for config in space.iter_outer(0, 1):
+        _wrap(config, path)
+        break
+    chunk_size = max(1, -(-size // (workers * 4)))
+    starts = list(range(0, size, chunk_size))
+    stops = [min(start + chunk_size, size) for start in starts]
+
+    configs = []
+    config_digests: Dict[str, int] = {}
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(space, path, Parser.dump_base_config_cache(), check),
+    ) as executor:
+        for chunk, keys in executor.map(_decode_range, starts, stops):
+            add_base_config_keys(keys)
+            for config in chunk:
+                digest = parser.config_digest(config)
+                if digest in config_digests:
+                    parser.raise_repeat_config(
+                        config, len(configs), config_digests[digest]
+                    )
+                config_digests[digest] = len(configs)
+                configs.append(config)
+    return configs
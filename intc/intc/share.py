@@ -3,11 +3,16 @@
 # This source code is licensed under the Apache license found in the
 # LICENSE file in the root directory of this source tree.
 
+import importlib
+import threading
 from typing import Any, Callable, Dict, Type, Union
 
 from intc.exceptions import NoModuleFoundError
 
+# {type_name: {name: module}}, the module can be the import path like "package.module:Class", which is imported on the first `get_registed_instance`
 registry: Dict[str, Any] = {}
+# the lock of importing the lazy registered modules, reentrant because importing one package may get other lazy modules
+_import_lock = threading.RLock()
 
 
 MISSING = "???"
@@ -34,6 +39,36 @@ def get_registed_instance(
         raise NoModuleFoundError(
             f"In '{type_name}' register, there is not a entry named '{name}'"
         )
+    module = registry[type_name][name]
+    if isinstance(module, str):
+        module = import_registed_module(type_name, name)
     if get_class:
+        return module
+    return module._from_dict
+
+
+def import_registed_module(type_name: str, name: str) -> Type:
+    """import the module registered by the import path("package.module:Class"), importing the package registers the real module
+
+    Args:
+        type_name: the module type name
+        name: the module name
+
+    Returns:
+        registered module
+
+    """
+    with _import_lock:
+        import_path = registry[type_name][name]
+        # imported by other thread
+        if not isinstance(import_path, str):
+            return import_path
+        module_path, _, qualname = import_path.partition(":")
+        package = importlib.import_module(module_path)
+        if isinstance(registry[type_name][name], str):
+            # the module is not registered by importing the package(like the registry is cleared), get it by the qualname
+            module = package
+            for attr in qualname.split("."):
+                module = getattr(module, attr)
+            registry[type_name][name] = module
         return registry[type_name][name]
-    return registry[type_name][name]._from_dict
@@ -0,0 +1,124 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+import importlib
+import os
+import pickle
+import sys
+from typing import Dict, Union
+
+import hjson
+
+from intc.exceptions import ValueError
+from intc.loader import load_submodule
+from intc.register import ic_help, ic_repo, type_module_map
+from intc.share import registry
+
+# increase it when the format of the snapshot is changed
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def get_import_path(module) -> Union[str, None]:
+    """get the import path("package.module:Class") of the registered module
+
+    Args:
+        module: the registered module(class) or its import path
+
+    Returns:
+        the import path, None if the module can not be imported by path(like defined in a function)
+    """
+    if isinstance(module, str):
+        return module
+    qualname = getattr(module, "__qualname__", "")
+    if not qualname or "<locals>" in qualname or module.__module__ == "__main__":
+        return None
+    return f"{module.__module__}:{qualname}"
+
+
+def build_snapshot(path: str) -> Dict:
+    """dump the ic_repo, ic_help, type_module_map and the import paths of the registered modules to the file, `load_snapshot` can restore them without importing the packages
+
+    Args:
+        path: the snapshot file path
+
+    Returns:
+        the snapshot
+    """
+    snapshot = {
+        "version": SNAPSHOT_FORMAT_VERSION,
+        "ic_repo": {key: ic_repo[key] for key in ic_repo},
+        "ic_help": {key: ic_help[key] for key in ic_help},
+        "type_module_map": {
+            type_name: set(names) for type_name, names in type_module_map.items()
+        },
+        "registry": {
+            type_name: {
+                name: get_import_path(module) for name, module in modules.items()
+            }
+            for type_name, modules in registry.items()
+        },
+    }
+    dir_name = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dir_name, exist_ok=True)
+    with open(path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return snapshot
+
+
+def load_snapshot(path: str) -> None:
+    """load the snapshot built by `build_snapshot`, the modules are registered by the import paths and imported on the first use, the entries already registered are kept
+
+    Args:
+        path: the snapshot file path
+
+    Returns:
+        None
+    """
+    with open(path, "rb") as f:
+        snapshot = pickle.load(f)
+    if snapshot.get("version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"The snapshot {path} version {snapshot.get('version')} is not supported, please rebuild it."
+        )
+    for type_name, modules in snapshot["registry"].items():
+        type_registry = registry.setdefault(type_name, {})
+        for name, import_path in modules.items():
+            if name not in type_registry and import_path is not None:
+                type_registry[name] = import_path
+    for key, config in snapshot["ic_repo"].items():
+        if key not in ic_repo:
+            ic_repo[key] = config
+    for key, help in snapshot["ic_help"].items():
+        if key not in ic_help:
+            ic_help[key] = help
+    for type_name, names in snapshot["type_module_map"].items():
+        type_module_map[type_name] = type_module_map.get(type_name, set()) | names
+
+
+def build_project_snapshot(root: str, path: str = "") -> str:
+    """import the `src` packages in the `.intc.json` of the project, load the submodules, and build the snapshot
+
+    Args:
+        root: the project root directory which contains the `.intc.json`
+        path: the snapshot file path, default is '{root}/.intc.snapshot'
+
+    Returns:
+        the snapshot file path
+    """
+    root = os.path.abspath(root)
+    intc_rc_config = {}
+    for meta_config in [".intc.json", ".intc.jsonc"]:
+        if os.path.isfile(os.path.join(root, meta_config)):
+            with open(os.path.join(root, meta_config), "r") as f:
+                intc_rc_config = hjson.load(f, object_pairs_hook=dict)
+            break
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    for package in intc_rc_config.get("src", []):
+        importlib.import_module(package)
+    load_submodule(root)
+    path = path or os.path.join(root, ".intc.snapshot")
+    build_snapshot(path)
+    return path
@@ -4,8 +4,13 @@
 # LICENSE file in the root directory of this source tree.
 
 import copy
+import functools
+import hashlib
 import inspect
+import json
 import re
+import sys
+import threading
 from typing import Any, Callable, Dict, List, Tuple, Type, Union
 
 from intc.exceptions import KeyNotFoundError, NameError, ValueMissingError
@@ -221,6 +226,103 @@ class UniModuleName(object):
         raise KeyNotFoundError(f"Key {key} is ambiguous in {self.origin_keys}")
 
 
+@functools.lru_cache(maxsize=1024)
+def get_uni_module_name(keys: Tuple[str, ...]) -> UniModuleName:
+    """get the UniModuleName of the keys, the same keys share one UniModuleName, so it should not be modified
+
+    Args:
+        keys: origin keys
+
+    Returns:
+        the shared UniModuleName
+    """
+    return UniModuleName(keys)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_lambda(lambda_str: str, module: str = __name__) -> Callable:
+    """compile the lambda source to function, every distinct lambda source is compiled only once
+
+    the hit/miss counters can be got by `compile_lambda.cache_info()`
+
+    Args:
+        lambda_str: the lambda source like "lambda x, y: x+y"
+        module: the name of the module whose namespace is the globals of the lambda, the link lambdas see the `intc.parser` namespace and the search lambdas see the `intc.utils` namespace
+
+    Returns:
+        the lambda function
+    """
+    return eval(lambda_str, vars(sys.modules[module]))
+
+
+def config_digest(config: Any) -> str:
+    """get the canonical digest of the config, the same config always has the same digest
+
+    the config is walked and fed to the hasher piece by piece(the dict keys are sorted), so the whole config is never serialized to one string
+
+    Args:
+        config: the config
+
+    Returns:
+        hex digest of the config
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    _update_digest(hasher, config)
+    return hasher.hexdigest()
+
+
+_digest_encoder = json.JSONEncoder(ensure_ascii=False, sort_keys=True)
+
+
+def _update_digest(hasher: Any, value: Any) -> None:
+    """feed the canonical representation of the value to the hasher, the dicts and lists which only contain scalars are encoded at once"""
+    if isinstance(value, dict):
+        if not any(isinstance(item, (dict, list, tuple)) for item in value.values()):
+            hasher.update(_digest_encoder.encode(value).encode("utf-8"))
+            return
+        hasher.update(b"{")
+        for key in sorted(value):
+            hasher.update(_digest_encoder.encode(str(key)).encode("utf-8"))
+            hasher.update(b":")
+            _update_digest(hasher, value[key])
+            hasher.update(b",")
+        hasher.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        if not any(isinstance(item, (dict, list, tuple)) for item in value):
+            hasher.update(_digest_encoder.encode(value).encode("utf-8"))
+            return
+        hasher.update(b"[")
+        for item in value:
+            _update_digest(hasher, item)
+            hasher.update(b",")
+        hasher.update(b"]")
+    else:
+        hasher.update(_digest_encoder.encode(value).encode("utf-8"))
+
+
+def freeze_value(value: Any, nested: bool = False) -> Any:
+    """convert the (nested) dict and list to the hashable frozenset and tuple, so they can be looked up in a set, other values are returned as is
+
+    The scalars in the dict and list are tagged with their types, so the nested `1`, `1.0` and `True` are not equal(the same as comparing the json dumped values).
+
+    Args:
+        value: the value to freeze
+        nested: whether the value is in a dict or list
+
+    Returns:
+        the hashable representation of the value
+    """
+    if isinstance(value, dict):
+        return frozenset(
+            (key, freeze_value(item, nested=True)) for key, item in value.items()
+        )
+    elif isinstance(value, (list, tuple)):
+        return tuple(freeze_value(item, nested=True) for item in value)
+    elif nested:
+        return (type(value), value)
+    return value
+
+
 def search_lambda_eval(search_para: Any) -> Any:
     """eval the lambda function in config
 
@@ -237,7 +339,7 @@ def search_lambda_eval(search_para: Any) -> Any:
         return [search_lambda_eval(v) for v in search_para]
     elif isinstance(search_para, str):
         if search_para.startswith("@lambda"):
-            return eval(f"lambda _:{':'.join(search_para.split(':')[1:])}")(0)
+            return compile_lambda(f"lambda _:{':'.join(search_para.split(':')[1:])}")(0)
         else:
             return search_para
     else:
@@ -323,6 +425,164 @@ def parser_lambda_key_value_pair(
         return {}
 
 
+class ReIterable(object):
+    """the re-iterable view of an iterator, the items are pulled from the iterator on demand, and kept for the next iteration only if `cache` is True"""
+
+    def __init__(self, iterable: Any):
+        self.iterator = iter(iterable)
+        self.items: List = []
+        self.cache = False
+
+    def peek(self, size: int) -> int:
+        """pull the items until `size` items are kept or the iterator is exhausted
+
+        Args:
+            size: the number of the items to keep
+
+        Returns:
+            the number of the kept items
+        """
+        while len(self.items) < size:
+            try:
+                self.items.append(next(self.iterator))
+            except StopIteration:
+                break
+        return len(self.items)
+
+    def __iter__(self):
+        index = 0
+        while True:
+            if index < len(self.items):
+                yield self.items[index]
+                index += 1
+                continue
+            try:
+                item = next(self.iterator)
+            except StopIteration:
+                return
+            if self.cache:
+                self.items.append(item)
+                index += 1
+            yield item
+
+
+class Lazy(object):
+    """the lazy value, the factory is called only once on the first `get`"""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self.done = False
+        self.value = None
+        self.lock = threading.Lock()
+
+    def get(self) -> Any:
+        # double-checked, the lock is only taken before the value is computed
+        if not self.done:
+            with self.lock:
+                if not self.done:
+                    self.value = self.factory()
+                    self.factory = None
+                    self.done = True
+        return self.value
+
+    def __repr__(self):
+        return f"Lazy({self.value!r})" if self.done else "Lazy(...)"
+
+
+class LazyAttribute(object):
+    """the class attribute computed by the `Lazy` on the first access"""
+
+    def __init__(self, lazy: Lazy):
+        self.lazy = lazy
+
+    def __get__(self, instance, owner):
+        return self.lazy.get()
+
+
+class LazyDict(dict):
+    """dict whose values can be `Lazy`, the lazy value is computed on the first access and replaced by the result"""
+
+    def __getitem__(self, key):
+        value = super(LazyDict, self).__getitem__(key)
+        if isinstance(value, Lazy):
+            value = value.get()
+            # the value is not changed, so the `VersionedDict.__setitem__` should not be called
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def copy(self):
+        return {key: self[key] for key in self}
+
+    def pop(self, *args):
+        value = super(LazyDict, self).pop(*args)
+        return value.get() if isinstance(value, Lazy) else value
+
+    def popitem(self):
+        key, value = super(LazyDict, self).popitem()
+        return key, value.get() if isinstance(value, Lazy) else value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            super(LazyDict, self).__setitem__(key, default)
+        return self[key]
+
+    def __eq__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+
+class VersionedDict(LazyDict):
+    """dict with a version number, the version is increased when the dict is modified, so the caches depend on the dict can check whether they are expired"""
+
+    def __init__(self, *args, **kwargs):
+        super(VersionedDict, self).__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        super(VersionedDict, self).__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super(VersionedDict, self).__delitem__(key)
+        self.version += 1
+
+    def clear(self):
+        super(VersionedDict, self).clear()
+        self.version += 1
+
+    def pop(self, *args):
+        self.version += 1
+        return super(VersionedDict, self).pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super(VersionedDict, self).popitem()
+
+    def setdefault(self, key, default=None):
+        self.version += 1
+        return super(VersionedDict, self).setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super(VersionedDict, self).update(*args, **kwargs)
+        self.version += 1
+
+
 class TrieNode:
     def __init__(self):
         self.children = {}
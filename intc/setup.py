@@ -46,4 +46,5 @@ setup(
     include_package_data=True,
     packages=pkgs,
     install_requires=requirements.strip().split("\n"),
+    entry_points={"console_scripts": ["intc=intc.cli:cli"]},
 )
@@ -3,11 +3,13 @@
 # This source code is licensed under the Apache license found in the
 # LICENSE file in the root directory of this source tree.
 
+import copy
 import json
 import os
 import sys
 
 import pytest
+from attrs.exceptions import FrozenInstanceError
 
 from intc import (
     FloatField,
@@ -16,9 +18,12 @@ from intc import (
     StrField,
     SubModule,
     cregister,
+    ic_help,
     ic_repo,
 )
-from intc.exceptions import ValueOutOfRangeError
+from intc.config import BasicConvert, StrConvert
+from intc.exceptions import ValueOutOfRangeError, ValueValidateError
+from intc.utils import Lazy
 
 
 @pytest.fixture(scope="module", autouse=True)
@@ -102,6 +107,79 @@ def test_module_registration_and_retrieval(ChildConfigForTestConfig):
     )
 
 
+def test_lazy_registry(ChildConfigForTestConfig):
+    key = ("child_module_for_test_config", "child_a")
+    # the registered default config and help are computed on the first access
+    assert isinstance(dict.__getitem__(ic_repo, key), Lazy)
+    assert isinstance(dict.__getitem__(ic_help, key), Lazy)
+    version = ic_repo.version
+    assert ic_repo[key] == {"i_am_child": "child value", "_name": "child_a"}
+    assert ic_repo.version == version
+    assert not isinstance(dict.__getitem__(ic_repo, key), Lazy)
+    assert ChildConfigForTestConfig.__meta__ is ic_help[key]
+    assert ic_help[key]["properties"]["i_am_child"]["description"] == "child value"
+
+
+def test_slotted_and_frozen(ConfigAForTestConfig, ChildConfigForTestConfig):
+    config = ConfigAForTestConfig()
+    assert not hasattr(config, "__dict__")
+    assert not hasattr(config.submodule, "__dict__")
+    # the ModuleFields which have the same keys share the key map
+    assert (
+        config.submodule.__uni_origin_keys_map__
+        is ConfigAForTestConfig().submodule.__uni_origin_keys_map__
+    )
+
+    @cregister("child_module_for_test_config", "child_frozen", frozen=True)
+    class FrozenChildConfigForTestConfig(ChildConfigForTestConfig):
+        """frozen child config"""
+
+    config = FrozenChildConfigForTestConfig._from_dict({"i_am_child": "frozen"})
+    assert config.i_am_child == "frozen"
+    with pytest.raises(FrozenInstanceError):
+        config.i_am_child = "changed"
+
+
+def test_module_field_copy(ConfigAForTestConfig):
+    config = ConfigAForTestConfig()
+    child = config.submodule["child_module_for_test_config#1"]
+    new_config = copy.deepcopy(config)
+    # the child data is shared, the inited child modules are copied
+    assert new_config.submodule.__child_data__ is config.submodule.__child_data__
+    new_child = new_config.submodule["child_module_for_test_config#1"]
+    assert new_child == child and new_child is not child
+    new_child.i_am_child = "changed"
+    assert child.i_am_child == "child value1"
+    # the lazy dumped child data can be modified without affecting the config
+    config._to_dict(lazy=True)["@child_module_for_test_config#2"]["_base"] = "x"
+    assert config.submodule["child_module_for_test_config#2"].i_am_child == (
+        "child value2"
+    )
+
+
+def test_module_field_owns_child_data(ConfigAForTestConfig):
+    config = {
+        "epsilon": 2.0,
+        "@child_module_for_test_config#1": {"_base": "child_a", "i_am_child": "a"},
+    }
+    sample = ConfigAForTestConfig._from_dict(config)
+    samples = ConfigAForTestConfig._from_dicts([config])
+    # modifying the source config after init does not change the submodules
+    config["@child_module_for_test_config#1"]["i_am_child"] = "changed"
+    assert sample.submodule["child_module_for_test_config#1"].i_am_child == "a"
+    assert samples[0].submodule["child_module_for_test_config#1"].i_am_child == "a"
+    # the same for the direct construction
+    submodule = {"child_module_for_test_config#1": {"_base": "child_a"}}
+    sample = ConfigAForTestConfig(submodule=submodule)
+    submodule["child_module_for_test_config#1"]["i_am_child"] = "changed"
+    submodule["child_module_for_test_config#2"] = {"_base": "child_a"}
+    assert list(sample.submodule) == ["child_module_for_test_config#1"]
+    assert sample.submodule["child_module_for_test_config#1"].i_am_child != "changed"
+    # the default child data is not shared between the instances
+    config, another = ConfigAForTestConfig(), ConfigAForTestConfig()
+    assert config.submodule.__child_data__ is not another.submodule.__child_data__
+
+
 # Test module registration and retrieval
 def test_config_dumps(ConfigA1ForTestConfig, config_dict):
     config = ConfigA1ForTestConfig()
@@ -136,6 +214,44 @@ def test_float_check(ConfigAForTestConfig, ConfigA1ForTestConfig):
     assert config.epsilon == -3.0
 
 
+# Test the dict and list values in options and additions
+def test_frozen_options():
+    convert = BasicConvert(options=[None, [1, {"a": 2}], {"k": ["v"]}])
+    assert convert([1, {"a": 2}]) == [1, {"a": 2}]
+    assert convert({"k": ["v"]}) == {"k": ["v"]}
+    with pytest.raises(ValueValidateError):
+        convert({"k": "v"})
+    # the nested scalars are compared with their types
+    convert = BasicConvert(options=[[1], {"k": 1}])
+    assert convert([1]) == [1]
+    for value in [[True], [1.0], {"k": True}, {"k": 1.0}]:
+        with pytest.raises(ValueValidateError):
+            convert(value)
+    convert = StrConvert(max_len=2, additions=[["long value"]])
+    assert convert(["long value"]) == ["long value"]
+    assert convert(12) == "12"
+    with pytest.raises(ValueOutOfRangeError):
+        convert("long value")
+
+
+# Test init the configs at once
+def test_from_dicts(ConfigAForTestConfig):
+    configs = [
+        {"_name": "config_a", "epsilon": 2.0},
+        {
+            "_name": "config_a",
+            "epsilon": 3.0,
+            "@child_module_for_test_config#1": {"_base": "child_a"},
+        },
+    ]
+    samples = ConfigAForTestConfig._from_dicts(configs)
+    assert [sample.epsilon for sample in samples] == [2.0, 3.0]
+    assert samples[0] == ConfigAForTestConfig._from_dict(configs[0])
+    assert list(samples[1].submodule) == ["child_module_for_test_config#1"]
+    with pytest.raises(ValueOutOfRangeError):
+        ConfigAForTestConfig._from_dicts([{"epsilon": 2.0}, {"epsilon": -3.0}])
+
+
 # Test field values of config objects
 def test_config_field_values(ConfigAForTestConfig, ConfigA1ForTestConfig):
     config = ConfigAForTestConfig()
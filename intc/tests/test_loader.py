@@ -0,0 +1,122 @@
+# Copyright cstsunfu.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from intc import IntField, Loader, cregister, ic_help, ic_repo
+from intc.exceptions import NameError
+from intc.utils import Lazy
+
+
+@pytest.fixture
+def module_dir(tmp_path):
+    @cregister("loader_test", "base")
+    class LoaderTestConfig:
+        """loader test config"""
+
+        value = IntField(value=0, help="value")
+
+    config_dir = tmp_path / "modules"
+    config_dir.mkdir()
+    with open(config_dir / "loader_test@a.json", "w") as f:
+        json.dump({"_base": "base", "value": 1}, f)
+    with open(config_dir / "loader_test@b.yaml", "w") as f:
+        f.write("_base: a\nvalue: 2\n")
+    with open(config_dir / "loader_test@c.hjson", "w") as f:
+        f.write("{\n  _base: a\n  // comment\n  value: 3\n}\n")
+    yield config_dir
+    clear_modules()
+    cregister.registry.pop("loader_test", None)
+    ic_repo.pop(("loader_test", "base"), None)
+
+
+def clear_modules():
+    for key in list(ic_repo):
+        if key[0] == "loader_test" and key[1] != "base":
+            del ic_repo[key]
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_load_files(module_dir, tmp_path, monkeypatch, workers):
+    cache_dir = str(tmp_path / "cache")
+    loader = Loader(workers=workers, cache=cache_dir)
+    loader.load_files(str(module_dir))
+    loader.resolve()
+    assert ic_repo[("loader_test", "b")] == {"_base": "a", "value": 2}
+    assert ic_repo[("loader_test", "c")] == {"_base": "a", "value": 3}
+    assert len(os.listdir(cache_dir)) == 1
+
+    # the unchanged files are loaded from the manifest, only the changed file is parsed again
+    clear_modules()
+    with open(module_dir / "loader_test@b.yaml", "w") as f:
+        f.write("_base: a\nvalue: 20\n")
+    monkeypatch.setattr(Loader, "load_json", None)
+    monkeypatch.setattr(Loader, "load_hjson", None)
+    loader = Loader(cache=cache_dir)
+    loader.load_files(str(module_dir))
+    loader.resolve()
+    assert ic_repo[("loader_test", "b")] == {"_base": "a", "value": 20}
+    assert ic_repo[("loader_test", "c")] == {"_base": "a", "value": 3}
+
+
+def test_resolve(module_dir):
+    loader = Loader()
+    # the modules are stashed before their bases
+    for i in range(100, 0, -1):
+        loader.stash(
+            {"_base": f"chain{i-1}" if i > 1 else "base", "value": i},
+            f"loader_test@chain{i}.json",
+            ("loader_test", f"chain{i-1}" if i > 1 else "base"),
+            ("loader_test", f"chain{i}"),
+        )
+    loader.stash(
+        {"_base": "missing"}, "m.json", ("loader_test", "missing"), ("loader_test", "m")
+    )
+    loader.stash({"_base": "y"}, "x.json", ("loader_test", "y"), ("loader_test", "x"))
+    loader.stash({"_base": "x"}, "y.json", ("loader_test", "x"), ("loader_test", "y"))
+    with pytest.raises(NameError) as exc_info:
+        loader.resolve()
+    assert ic_repo[("loader_test", "chain100")]["value"] == 100
+    message = str(exc_info.value)
+    assert "('loader_test', 'missing') is not found, required by: ['m.json']" in message
+    assert (
+        "('loader_test', 'x') -> ('loader_test', 'y') -> ('loader_test', 'x')"
+        in message
+    )
+    assert set(loader.stashed) == {("loader_test", key) for key in "mxy"}
+
+
+def test_lazy_help(module_dir):
+    loader = Loader()
+    loader.load_files(str(module_dir))
+    loader.resolve()
+    # the help is derived from the base on the first access
+    assert isinstance(dict.__getitem__(ic_help, ("loader_test", "b")), Lazy)
+    assert ic_help[("loader_test", "b")]["inter_files"] == [
+        str(module_dir / "loader_test@a.json"),
+        str(module_dir / "loader_test@b.yaml"),
+    ]
+    for key in "abc":
+        ic_help.pop(("loader_test", key), None)
+
+
+def test_lazy_thread_safe():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.01)
+        return len(calls)
+
+    lazy = Lazy(factory)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(executor.map(lambda _: lazy.get(), range(32)))
+    assert values == [1] * 32
+    assert len(calls) == 1
@@ -0,0 +1,107 @@
+# Copyright cstsunfu.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+import json
+import sys
+import threading
+
+import pytest
+
+from intc import Parser, cregister, ic_help, ic_repo, load_snapshot, type_module_map
+from intc.cli import cli
+
+MODULE_SOURCE = '''
+from intc import IntField, cregister
+
+
+@cregister("snapshot_test", "a")
+class SnapshotTestConfig:
+    """snapshot test config"""
+
+    value = IntField(value=1, help="value")
+'''
+
+
+@pytest.fixture
+def project(tmp_path):
+    with open(tmp_path / "snapshot_test_src.py", "w") as f:
+        f.write(MODULE_SOURCE)
+    with open(tmp_path / ".intc.json", "w") as f:
+        json.dump({"src": ["snapshot_test_src"]}, f)
+    sys.path.insert(0, str(tmp_path))
+    yield tmp_path
+    sys.modules.pop("snapshot_test_src", None)
+    sys.path.remove(str(tmp_path))
+    clear_registry()
+
+
+def clear_registry():
+    cregister.registry.pop("snapshot_test", None)
+    type_module_map.pop("snapshot_test", None)
+    # the lazy entries are removed without computing them
+    for repo in (ic_repo, ic_help):
+        if ("snapshot_test", "a") in repo:
+            del repo[("snapshot_test", "a")]
+
+
+def test_snapshot(project):
+    cli(["snapshot", "build", "--root", str(project)])
+    assert "snapshot_test_src" in sys.modules
+
+    # restart from the snapshot without importing the package
+    sys.modules.pop("snapshot_test_src")
+    clear_registry()
+    load_snapshot(str(project / ".intc.snapshot"))
+    assert "snapshot_test_src" not in sys.modules
+    assert (
+        cregister.registry["snapshot_test"]["a"]
+        == "snapshot_test_src:SnapshotTestConfig"
+    )
+    assert ic_repo[("snapshot_test", "a")] == {"value": 1, "_name": "a"}
+    assert (
+        ic_help[("snapshot_test", "a")]["properties"]["value"]["description"] == "value"
+    )
+    assert type_module_map["snapshot_test"] == {"a"}
+
+    # the package is imported on the first use
+    config = cregister.get("snapshot_test", "a")({"value": 2})
+    assert "snapshot_test_src" in sys.modules
+    assert config.value == 2
+    assert not isinstance(cregister.registry["snapshot_test"]["a"], str)
+
+
+def test_lazy_register(project):
+    cregister.load_manifest(
+        {"snapshot_test": {"a": "snapshot_test_src:SnapshotTestConfig"}}
+    )
+    assert "snapshot_test_src" not in sys.modules
+    assert type_module_map["snapshot_test"] == {"a"}
+
+    # the package is imported only once by the concurrent lookups
+    modules = []
+    threads = [
+        threading.Thread(
+            target=lambda: modules.append(
+                cregister.get("snapshot_test", "a", get_class=True)
+            )
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(modules) == 8 and all(module is modules[0] for module in modules)
+    assert modules[0].__name__ == "SnapshotTestConfig"
+
+    # the config of the lazy module is available after importing
+    clear_registry()
+    sys.modules.pop("snapshot_test_src")
+    cregister.register_lazy(
+        "snapshot_test", "a", "snapshot_test_src:SnapshotTestConfig"
+    )
+    config = Parser({"@snapshot_test": {"_base": "a"}}).parser_init()[0]
+    assert config["@snapshot_test"].value == 1
+    assert ic_help[("snapshot_test", "a")]["description"] == "snapshot test config"
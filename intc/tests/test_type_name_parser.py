@@ -3,6 +3,7 @@
 # This source code is licensed under the Apache license found in the
 # LICENSE file in the root directory of this source tree.
 
+import copy
 import json
 import os
 import sys
@@ -15,13 +16,15 @@ from intc import (
     ListField,
     NestField,
     Parser,
+    SearchSpace,
     StrField,
     SubModule,
     cregister,
     ic_repo,
     init_config,
 )
-from intc.exceptions import ValueOutOfRangeError
+from intc.exceptions import ParserConfigRepeatError, ValueOutOfRangeError
+from intc.utils import compile_lambda
 
 
 @pytest.fixture(scope="module", autouse=True)
@@ -130,6 +133,336 @@ def test_reference_parser(
     assert init_config(configs[2])["@module_for_test_parser"].epsilon == 8
 
 
+def test_iter_parser(ConfigAForTestParser, ChildConfigForTestParser):
+    config = {
+        "@module_for_test_parser": {
+            "_base": "config_a",
+            "@child_module_for_test_parser#1": {
+                "i_am_float_child": "@$$.epsilon @lambda x: x+1"
+            },
+        },
+        "_search": {
+            "@module_for_test_parser.epsilon": [3, 4, 8.0],
+            "@module_for_test_parser.list_test": [["a"], ["b"]],
+        },
+    }
+    parser = Parser(copy.deepcopy(config))
+    configs = parser.parser()
+    # all the configs share the same link plan
+    assert len(parser.ref_plans) == 1
+    config_iter = Parser(copy.deepcopy(config)).iter_parser()
+    assert not isinstance(config_iter, list)
+    assert list(config_iter) == configs
+    assert len(configs) == 6
+    # the configs share nothing with each other
+    configs[0]["@module_for_test_parser"]["nested"]["nest_key"] = "changed"
+    assert configs[1]["@module_for_test_parser"]["nested"]["nest_key"] == "nest value"
+
+    # the same lambda is compiled only once
+    compile_lambda.cache_clear()
+    Parser(copy.deepcopy(config)).parser()
+    assert compile_lambda.cache_info().misses == 1
+    assert compile_lambda.cache_info().hits == 5
+
+    init_configs = Parser(copy.deepcopy(config)).parser_init_iter()
+    first = next(init_configs)
+    assert first["@module_for_test_parser"].epsilon == 3
+    assert first["@module_for_test_parser"]["@#1"].i_am_float_child == 4
+    assert len(list(init_configs)) == 5
+
+    # the link lambdas see the module namespace of `intc.parser`
+    child = config["@module_for_test_parser"]["@child_module_for_test_parser#1"]
+    child["i_am_float_child"] = "@$$.epsilon @lambda x: x+1 if MISSING else 0"
+    first = Parser(copy.deepcopy(config)).parser()[0]["@module_for_test_parser"]
+    assert first["@child_module_for_test_parser#1"]["i_am_float_child"] == 4
+
+
+def test_iter_parser_is_lazy(ConfigAForTestParser, monkeypatch):
+    config = {
+        "@module_for_test_parser": {"_base": "config_a"},
+        "_search": {
+            "@module_for_test_parser.epsilon": list(range(20)),
+            "@module_for_test_parser.nested.nest_key2": list(range(20)),
+        },
+    }
+    update_search_para = Parser.update_search_para
+    expansions = []
+
+    def counting_update_search_para(config, search_para):
+        expansions.append(search_para)
+        return update_search_para(config, search_para)
+
+    monkeypatch.setattr(Parser, "update_search_para", counting_update_search_para)
+    config_iter = Parser(copy.deepcopy(config)).iter_parser()
+    first = next(config_iter)
+    # the first config is yielded before the whole grid is expanded
+    assert len(expansions) == 1
+    assert first["@module_for_test_parser"]["epsilon"] == 0
+    assert len(list(config_iter)) == 399
+    assert len(expansions) == 400
+
+    # the repeat configs are yielded if the check is skipped
+    config["_search"]["@module_for_test_parser.epsilon"] = [1.0, 1.0]
+    with pytest.raises(ParserConfigRepeatError):
+        list(Parser(copy.deepcopy(config)).iter_parser())
+    configs = list(Parser(copy.deepcopy(config)).iter_parser(check_repeat=False))
+    assert len(configs) == 40 and configs[0] == configs[1]
+
+
+def test_search_space(
+    ConfigAForTestParser, ChildConfigForTestParser, ConfigA1ForTestParser
+):
+    config = {
+        "@module_for_test_parser": {
+            "_base": "config_a",
+            "@child_module_for_test_parser#1": {
+                "i_am_float_child": "@$$.epsilon @lambda x: x+1",
+                "_search": {"i_am_child": ["a", "b"]},
+            },
+        },
+        "_search": {
+            "@module_for_test_parser.epsilon": [3, 4, 8.0],
+        },
+    }
+    configs = Parser(copy.deepcopy(config)).parser()
+    space = SearchSpace(Parser(copy.deepcopy(config)))
+    assert len(space) == len(configs) == 6
+    assert list(space) == configs
+    assert space[4] == configs[4]
+    assert space[-1] == configs[-1]
+    assert space[1:5:2] == configs[1:5:2]
+    assert list(space.shard(1, 4)) == configs[1::4]
+    with pytest.raises(IndexError):
+        space[6]
+
+    # the list and plain dict values are not expanded, so the space is not counted
+    config["_search"]["@module_for_test_parser.list_test"] = [["a"], ["b", "c"]]
+    config["_search"]["@module_for_test_parser.nested"] = [{"nest_key": "x"}]
+    configs = Parser(copy.deepcopy(config)).parser()
+    space = SearchSpace(Parser(copy.deepcopy(config)))
+    assert not space.offsets
+    assert len(space) == len(configs) == 12
+    assert list(space) == configs
+
+    # the searched submodules expand to different number of configs
+    config = {
+        "_search": {
+            "@module_for_test_parser": [
+                {"_base": "config_a", "_search": {"epsilon": [1, 2]}},
+                {"_base": "config_a_1"},
+            ]
+        },
+        "@module_for_test_parser": "config_a",
+    }
+    configs = Parser(copy.deepcopy(config)).parser()
+    space = SearchSpace(Parser(copy.deepcopy(config)))
+    assert len(space) == len(configs) == 3
+    assert [space[i] for i in range(3)] == configs
+    assert Parser(copy.deepcopy(config)).parser(workers=2) == configs
+
+
+def test_parallel_parser(ConfigAForTestParser, ChildConfigForTestParser):
+    config = {
+        "@module_for_test_parser": {
+            "_base": "config_a",
+            "@child_module_for_test_parser#1": {
+                "i_am_float_child": "@$$.epsilon @lambda x: x+1",
+                "_search": {"i_am_child": ["a", "b", "c"]},
+            },
+        },
+        "_search": {
+            "@module_for_test_parser.epsilon": list(range(10)),
+        },
+    }
+    configs = Parser(copy.deepcopy(config)).parser()
+    assert Parser(copy.deepcopy(config)).parser(workers=3) == configs
+    init_configs = Parser(copy.deepcopy(config)).parser_init(workers=3)
+    assert len(init_configs) == 30
+    assert init_configs[-1]["@module_for_test_parser"]["@#1"].i_am_float_child == 10
+
+    config["_search"]["@module_for_test_parser.epsilon"] = [
+        0.0,
+        "@$.nested.nest_key2 @lambda x: x",
+    ]
+    with pytest.raises(ParserConfigRepeatError):
+        Parser(copy.deepcopy(config)).parser(workers=2)
+
+
+def test_parallel_parser_split(
+    ConfigAForTestParser, ChildConfigForTestParser, ConfigA1ForTestParser, monkeypatch
+):
+    # the parent process only expands the first outer combination, the others are counted and expanded by the workers
+    expansions = []
+    get_search_space = SearchSpace._get_search_space
+
+    def counting_get_search_space(self, module_index, search_index):
+        expansions.append((module_index, search_index))
+        return get_search_space(self, module_index, search_index)
+
+    parent_expansions = []
+    for size in [20, 200]:
+        config = {
+            "_search": {
+                "@module_for_test_parser": [
+                    {"_base": "config_a", "_search": {"epsilon": [i, i + 0.5]}}
+                    for i in range(size)
+                ]
+                + [{"_base": "config_a_1"}]
+            },
+            "@module_for_test_parser": "config_a",
+        }
+        configs = Parser(copy.deepcopy(config)).parser()
+        assert len(configs) == size * 2 + 1
+
+        expansions.clear()
+        with monkeypatch.context() as m:
+            m.setattr(SearchSpace, "_get_search_space", counting_get_search_space)
+            assert Parser(copy.deepcopy(config)).parser(workers=2) == configs
+        parent_expansions.append(len(expansions))
+    assert parent_expansions[0] == parent_expansions[1] < 20
+
+
+def test_base_config_cache(ConfigAForTestParser):
+    base_config = Parser.get_base_config("module_for_test_parser", "config_a")
+    base_config["epsilon"] = 100.0
+    assert (
+        Parser.get_base_config("module_for_test_parser", "config_a")["epsilon"] == 1.0
+    )
+
+    ic_repo[("module_for_test_parser", "config_a_2")] = {
+        "_base": "config_a",
+        "epsilon": 5.0,
+    }
+    assert (
+        Parser.get_base_config("module_for_test_parser", "config_a_2")["epsilon"] == 5.0
+    )
+    # the cache is invalidated when the ic_repo is modified
+    ic_repo[("module_for_test_parser", "config_a_2")] = {
+        "_base": "config_a",
+        "epsilon": 6.0,
+    }
+    assert (
+        Parser.get_base_config("module_for_test_parser", "config_a_2")["epsilon"] == 6.0
+    )
+    del ic_repo[("module_for_test_parser", "config_a_2")]
+    assert Parser.get_base_config("module_for_test_parser", "config_a_2") == {}
+
+
+def test_reference_circle(ConfigAForTestParser, ChildConfigForTestParser):
+    config = {
+        "@module_for_test_parser": {
+            "_base": "config_a",
+            "epsilon": "@$.nested.nest_key2 @lambda x: x",
+            "nested": {"nest_key2": "@$.#1.i_am_float_child @lambda x: x"},
+            "@child_module_for_test_parser#1": {
+                "i_am_float_child": "@$$.epsilon @lambda x: x+1"
+            },
+        },
+    }
+    with pytest.raises(PermissionError) as exc_info:
+        Parser(config).parser()
+    circle = str(exc_info.value).split("\n")[0]
+    module_trace = "@__root__init__.@module_for_test_parser"
+    assert f"{module_trace}.epsilon -> " in circle
+    assert f"{module_trace}.nested.nest_key2 -> " in circle
+    assert (
+        f"{module_trace}.@child_module_for_test_parser#1.i_am_float_child -> " in circle
+    )
+
+
+def test_disk_cache(
+    ConfigAForTestParser, ChildConfigForTestParser, tmp_path, monkeypatch
+):
+    config = {
+        "@module_for_test_parser": {
+            "_base": "config_a",
+            "@child_module_for_test_parser#1": {
+                "i_am_float_child": "@$$.epsilon @lambda x: x+1"
+            },
+        },
+        "_search": {"@module_for_test_parser.epsilon": [3, 4]},
+    }
+    configs = Parser(copy.deepcopy(config), cache=str(tmp_path)).parser()
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # the warm parser loads the configs from the disk
+    with monkeypatch.context() as m:
+        m.setattr(Parser, "iter_parser", None)
+        assert Parser(copy.deepcopy(config), cache=str(tmp_path)).parser() == configs
+        init_configs = Parser(copy.deepcopy(config), cache=str(tmp_path)).parser_init()
+        assert init_configs[1]["@module_for_test_parser"].epsilon == 4
+
+    # the cache is invalid once the used base config is changed
+    key = ("module_for_test_parser", "config_a")
+    origin = ic_repo[key]
+    ic_repo[key] = dict(origin, list_test=["changed"])
+    try:
+        configs = Parser(copy.deepcopy(config), cache=str(tmp_path)).parser()
+        assert configs[0]["@module_for_test_parser"]["list_test"] == ["changed"]
+    finally:
+        ic_repo[key] = origin
+    assert Parser(copy.deepcopy(config), cache=str(tmp_path)).parser()[0][
+        "@module_for_test_parser"
+    ]["list_test"] == ["name"]
+
+
+def test_repeat_config(ConfigAForTestParser, ChildConfigForTestParser):
+    config = {
+        "@module_for_test_parser": {
+            "_base": "config_a",
+            "@child_module_for_test_parser#1": {
+                "_search": {"i_am_child": ["a", "b"]},
+            },
+        },
+        "_search": {
+            "@module_for_test_parser.epsilon": [
+                0.0,
+                1.0,
+                "@$.nested.nest_key2 @lambda x: x",
+            ],
+        },
+    }
+    with pytest.raises(ParserConfigRepeatError) as exc_info:
+        Parser(config).parser()
+    # the linked epsilon is the same as the searched 0.0
+    assert "the 2th config is the same as the 0th config" in str(exc_info.value)
+    assert (
+        "'@module_for_test_parser.epsilon': {'index': [0, 2], 'value': [0.0, '@$.nested.nest_key2"
+        in str(exc_info.value)
+    )
+    assert (
+        "i_am_child': {'index': [0, 0], 'value': ['a', 'a'], 'differ': False}"
+        in str(exc_info.value)
+    )
+
+    # the equal candidates are reported with the different indexes
+    config = {
+        "@module_for_test_parser": {"_base": "config_a"},
+        "_search": {
+            "@module_for_test_parser.epsilon": [1.0, 2.0],
+            "@module_for_test_parser.list_test": [["a"], ["a"]],
+        },
+    }
+    with pytest.raises(ParserConfigRepeatError) as exc_info:
+        Parser(config).parser()
+    assert "the 2th config is the same as the 0th config" in str(exc_info.value)
+    assert (
+        "'@module_for_test_parser.epsilon': {'index': [0, 0], 'value': [1.0, 1.0], 'differ': False}"
+        in str(exc_info.value)
+    )
+    assert (
+        "'@module_for_test_parser.list_test': {'index': [0, 1], 'value': [['a'], ['a']], 'differ': True}"
+        in str(exc_info.value)
+    )
+
+    parser = Parser(config)
+    assert parser.is_rep_config([{"a": 1, "b": [1, 2]}, {"b": [1, 2], "a": 1}])
+    assert not parser.is_rep_config([{"a": 1}, {"a": 1.0}])
+    assert parser.config_digest({"a": [1, {"b": "c"}]}) == parser.config_digest(
+        {"a": [1, {"b": "c"}]}
+    )
+
+
 # Run the tests
 if __name__ == "__main__":
     pytest.main()
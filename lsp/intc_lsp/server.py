@@ -3,6 +3,7 @@
 # This source code is licensed under the Apache license found in the
 # LICENSE file in the root directory of this source tree.
 
+import asyncio
 import importlib
 import io
 import json
@@ -17,6 +18,7 @@ from urllib.parse import urlparse
 import hjson
 from intc import ic_repo
 from intc.loader import load_submodule
+from intc.snapshot import load_snapshot
 from lsprotocol.types import (
     ALL_TYPES_MAP,
     INITIALIZE,
@@ -25,6 +27,7 @@ from lsprotocol.types import (
     TEXT_DOCUMENT_COMPLETION,
     TEXT_DOCUMENT_DEFINITION,
     TEXT_DOCUMENT_DID_CHANGE,
+    TEXT_DOCUMENT_DID_CLOSE,
     TEXT_DOCUMENT_DID_OPEN,
     TEXT_DOCUMENT_DID_SAVE,
     TEXT_DOCUMENT_FORMATTING,
@@ -79,8 +82,9 @@ class IntcLanguageServer(LanguageServer):
         self,
         name,
         version,
-        text_document_sync_kind=TextDocumentSyncKind.Full,
+        text_document_sync_kind=TextDocumentSyncKind.Incremental,
         max_workers=4,
+        diagnostics_delay=0.2,
     ) -> None:
         super().__init__(
             name=name,
@@ -94,6 +98,73 @@ class IntcLanguageServer(LanguageServer):
         self.modules_pattern = ""
         self.support_file_types = ["json", "yaml", "yml", "jsonc", "hjson", "json5"]
         self.entry_pattern = ""
+        # wait for the user to stop typing(seconds) before running the diagnostics
+        self.diagnostics_delay = diagnostics_delay
+        self.diagnostics_tasks: Dict[str, asyncio.Task] = {}
+
+    def schedule_diagnostics(self, uri: str, delay: float = None) -> None:
+        """run the diagnostics of the document in the background after the delay, the pending or running diagnostics of the older version are cancelled
+        Args:
+            uri:
+                the document uri
+            delay:
+                the seconds to wait, default is `self.diagnostics_delay`
+        Returns:
+            None
+        """
+        self.cancel_diagnostics(uri)
+        if self.resolve is None:
+            return
+        if delay is None:
+            delay = self.diagnostics_delay
+        version = self.workspace.get_text_document(uri).version
+        self.diagnostics_tasks[uri] = self.loop.create_task(
+            self.publish_latest_diagnostics(uri, version, delay)
+        )
+
+    def cancel_diagnostics(self, uri: str) -> None:
+        """cancel the pending or running diagnostics of the document
+        Args:
+            uri:
+                the document uri
+        Returns:
+            None
+        """
+        task = self.diagnostics_tasks.pop(uri, None)
+        if task is not None:
+            task.cancel()
+
+    async def publish_latest_diagnostics(
+        self, uri: str, version: Optional[int], delay: float
+    ) -> None:
+        """wait the delay and resolve the diagnostics in the worker thread, the diagnostics are only published when the document is still at the version
+        Args:
+            uri:
+                the document uri
+            version:
+                the document version when the diagnostics is scheduled
+            delay:
+                the seconds to wait
+        Returns:
+            None
+        """
+        await asyncio.sleep(delay)
+        logger.info(f"diagnostics: uri: {uri}, version: {version}")
+        try:
+            # the running resolve can not be stopped, the result of the cancelled task is dropped
+            display_diagnostics = await self.loop.run_in_executor(
+                self.thread_pool_executor, self.resolve.diagnostics, uri
+            )
+        except Exception as e:
+            logger.error(f"diagnostics: error : {e}")
+            return
+        finally:
+            if self.diagnostics_tasks.get(uri) is asyncio.current_task():
+                self.diagnostics_tasks.pop(uri)
+        if self.workspace.get_text_document(uri).version != version:
+            return
+        logger.info(f"display: {display_diagnostics}")
+        self.publish_diagnostics(uri, display_diagnostics, version=version)
 
     def update_config_partern(self, root_path):
         """update the pattern of the entry and modules
@@ -184,7 +255,17 @@ class IntcLanguageServer(LanguageServer):
         except:
             logger.error(f"init: add root path {real_root} error")
         os.environ["IN_INTC"] = "1"
-        for package in self.options.get("src", []):
+        # start from the registry snapshot(built by `intc snapshot build`) if provided, the packages are not imported
+        snapshot = self.options.get("snapshot", "")
+        if snapshot:
+            try:
+                load_snapshot(os.path.join(str(real_root), snapshot))
+                logger.info(f"init: load snapshot {snapshot}")
+            except Exception as e:
+                logger.error(f"init: load snapshot `{snapshot}` error : {e}")
+                snapshot = ""
+        packages = [] if snapshot else self.options.get("src", [])
+        for package in packages:
             try:
                 importlib.import_module(package)
                 logger.info(f"init: import {package}")
@@ -297,38 +378,29 @@ def definition(params: TextDocumentPositionParams) -> Optional[List[Location]]:
         return definitions
 
 
-def diagnostics(params: TextDocumentPositionParams) -> None:
-    """publish the diagnostics hint
-    Args:
-        server:
-            the intc LanguageServer
-        params:
-            the parameters provide by the client, provide the source uri
-    Returns:
-        None
-    """
-
-    logger.info(f"diagnostics: paras: {params}")
-    try:
-        display_diagnostics = intc_server.resolve.diagnostics(params.text_document.uri)
-    except Exception as e:
-        logger.error(f"diagnostics: error : {e}")
-        return
-    logger.info(f"display: {display_diagnostics}")
-    intc_server.publish_diagnostics(params.text_document.uri, display_diagnostics)
-
-
 @intc_server.feature(TEXT_DOCUMENT_DID_OPEN)
 def did_open(params):
     logger.info(f"did_open: paras: {params}")
     intc_server.init_new_file(params)
-    diagnostics(params)
+    intc_server.schedule_diagnostics(params.text_document.uri, delay=0)
 
 
 @intc_server.feature(TEXT_DOCUMENT_DID_CHANGE)
 def did_change(params):
     logger.info(f"did_change: paras: {params}")
-    diagnostics(params)
+    if intc_server.resolve is not None:
+        intc_server.resolve.update_document(
+            params.text_document.uri, params.content_changes
+        )
+    intc_server.schedule_diagnostics(params.text_document.uri)
+
+
+@intc_server.feature(TEXT_DOCUMENT_DID_CLOSE)
+def did_close(params):
+    logger.info(f"did_close: paras: {params}")
+    intc_server.cancel_diagnostics(params.text_document.uri)
+    if intc_server.resolve is not None:
+        intc_server.resolve.close_document(params.text_document.uri)
 
 
 if __name__ == "__main__":
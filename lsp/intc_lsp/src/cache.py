@@ -0,0 +1,123 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+from intc_lsp.src.edit import EditableTree
+from intc_lsp.src.trace import TraceIndex
+
+
+class DocumentState(object):
+    """the cached results of a document, the results except the tree-sitter tree are only valid for one version of the document"""
+
+    def __init__(self, max_cursors: int = 256):
+        """
+        Args:
+            max_cursors: the max number of the cached cursor results
+        """
+        super(DocumentState, self).__init__()
+        self.max_cursors = max_cursors
+        # the tree-sitter tree is kept across the versions for the incremental parsing
+        self.tree: Optional[EditableTree] = None
+        self.version: Optional[int] = None
+        self.parser_tree: Any = None
+        # the position index of the parser_tree
+        self.trace_index = TraceIndex()
+        self.cursors: OrderedDict = OrderedDict()
+        self.diagnostics: Optional[List] = None
+        self.diagnostics_key: Hashable = None
+
+    def at_version(self, version: Optional[int]) -> bool:
+        """drop the cached results of the other versions
+
+        Args:
+            version: the current version of the document, `None` means the version is unknown and nothing is cached
+
+        Returns:
+            whether the cached results can be used
+        """
+        if version is None or version != self.version:
+            self.version = version
+            self.parser_tree = None
+            self.trace_index = TraceIndex()
+            self.cursors.clear()
+            self.diagnostics = None
+            self.diagnostics_key = None
+        return version is not None
+
+    def get_cursor(self, key: Hashable) -> Any:
+        """get the cached cursor result
+
+        Args:
+            key: the cursor key, like (position, module_type, is_entry)
+
+        Returns:
+            the cached result or None
+        """
+        if key not in self.cursors:
+            return None
+        self.cursors.move_to_end(key)
+        return self.cursors[key]
+
+    def set_cursor(self, key: Hashable, result: Any) -> None:
+        """cache the cursor result, the least recently used result is dropped when the cache is full
+
+        Args:
+            key: the cursor key
+            result: the cursor result
+
+        Returns:
+            None
+        """
+        self.cursors[key] = result
+        self.cursors.move_to_end(key)
+        while len(self.cursors) > self.max_cursors:
+            self.cursors.popitem(last=False)
+
+
+class DocumentCache(object):
+    """the per-document cache of the resolver, the states of the least recently used documents are dropped when there are too many documents, and the state is dropped when the document is closed"""
+
+    def __init__(self, max_documents: int = 64, max_cursors: int = 256):
+        """
+        Args:
+            max_documents: the max number of the cached documents
+            max_cursors: the max number of the cached cursor results of every document
+        """
+        super(DocumentCache, self).__init__()
+        self.max_documents = max_documents
+        self.max_cursors = max_cursors
+        self.documents: Dict[str, DocumentState] = OrderedDict()
+
+    def get(self, uri: str) -> DocumentState:
+        """get the state of the document, create it if not exists
+
+        Args:
+            uri: the document uri
+
+        Returns:
+            the document state
+        """
+        if uri not in self.documents:
+            self.documents[uri] = DocumentState(self.max_cursors)
+        self.documents.move_to_end(uri)
+        while len(self.documents) > self.max_documents:
+            self.documents.popitem(last=False)
+        return self.documents[uri]
+
+    def pop(self, uri: str) -> None:
+        """drop the state of the document
+
+        Args:
+            uri: the document uri
+
+        Returns:
+            None
+        """
+        self.documents.pop(uri, None)
+
+    def __contains__(self, uri: str) -> bool:
+        return uri in self.documents
@@ -4,8 +4,9 @@
 # LICENSE file in the root directory of this source tree.
 
 import time
+from typing import Any, Dict, Optional, Tuple
 
-from tree_sitter import Language, Parser
+from tree_sitter import Language, Parser, Tree
 
 
 def get_change(old_source_byte: bytes, new_source_byte: bytes):
@@ -18,34 +19,180 @@ def get_change(old_source_byte: bytes, new_source_byte: bytes):
     """
     old_byte_lines = old_source_byte.split(b"\n")
     new_byte_lines = new_source_byte.split(b"\n")
+    min_lines = min(len(old_byte_lines), len(new_byte_lines))
     start_line = 0
     start_byte = 0
-    old_end_line = len(old_byte_lines)
-    new_end_line = len(new_byte_lines)
+    while (
+        start_line < min_lines - 1
+        and old_byte_lines[start_line] == new_byte_lines[start_line]
+    ):
+        start_byte += len(old_byte_lines[start_line]) + 1
+        start_line += 1
+
+    # the unchanged lines at the end, the changed range keeps at least one line
+    end_lines = 0
     old_end_byte = len(old_source_byte)
     new_end_byte = len(new_source_byte)
-    for i in range(min(len(old_byte_lines), len(new_byte_lines))):
-        if not old_byte_lines[i] == new_byte_lines[i]:
-            break
-        start_line = i
-        start_byte += len(old_byte_lines) + 1
-
-    for i in range(1, min(len(old_byte_lines), len(new_byte_lines))):
-        if not old_byte_lines[-i] == new_byte_lines[-i]:
-            old_end_line -= i
-            new_end_line -= i
-            break
-        cur_line_byte = len(old_byte_lines[-i]) + 1
-        old_end_byte -= cur_line_byte
-        new_end_byte -= cur_line_byte
+    while (
+        start_line + end_lines < min_lines - 1
+        and old_byte_lines[-end_lines - 1] == new_byte_lines[-end_lines - 1]
+    ):
+        old_end_byte -= len(old_byte_lines[-end_lines - 1]) + 1
+        new_end_byte -= len(new_byte_lines[-end_lines - 1]) + 1
+        end_lines += 1
+    old_end_line = len(old_byte_lines) - end_lines - 1
+    new_end_line = len(new_byte_lines) - end_lines - 1
     return {
         "start_byte": start_byte,
         "old_end_byte": old_end_byte,
         "new_end_byte": new_end_byte,
         "start_point": (start_line, 0),
-        "old_end_point": (old_end_line, 0),
-        "new_end_point": (new_end_line, 0),
+        "old_end_point": (old_end_line, len(old_byte_lines[old_end_line])),
+        "new_end_point": (new_end_line, len(new_byte_lines[new_end_line])),
+    }
+
+
+def get_byte_point(source_byte: bytes, line: int, character: int) -> Tuple[int, int]:
+    """convert the LSP position(the character is counted in utf-16 code units) to the byte offset and the tree-sitter point(the column is counted in bytes)
+
+    Args:
+        source_byte: the utf-8 source
+        line: the line of the position
+        character: the utf-16 character of the position, the position after the line end means the line end
+
+    Returns:
+        the byte offset and the column in bytes
+    """
+    line_start = 0
+    for _ in range(line):
+        line_end = source_byte.find(b"\n", line_start)
+        if line_end == -1:
+            # the position after the last line means the end of the source
+            return len(source_byte), len(source_byte) - line_start
+        line_start = line_end + 1
+    line_end = source_byte.find(b"\n", line_start)
+    if line_end == -1:
+        line_end = len(source_byte)
+    line_text = source_byte[line_start:line_end].decode("utf8", errors="replace")
+    units = 0
+    column = 0
+    for c in line_text:
+        if units >= character:
+            break
+        units += 2 if ord(c) > 0xFFFF else 1
+        column += len(c.encode("utf8"))
+    column = min(column, line_end - line_start)
+    return line_start + column, column
+
+
+def get_edit(old_source_byte: bytes, change_range: Any, text: str):
+    """get the tree-sitter edit of the LSP content change, and the changed source
+
+    Args:
+        old_source_byte: the source before the change
+        change_range: the `Range` of the content change
+        text: the new text of the range
+
+    Returns:
+        the edit(the arguments of `Tree.edit`) and the changed source
+    """
+    start_line, end_line = change_range.start.line, change_range.end.line
+    start_byte, start_column = get_byte_point(
+        old_source_byte, start_line, change_range.start.character
+    )
+    old_end_byte, old_end_column = get_byte_point(
+        old_source_byte, end_line, change_range.end.character
+    )
+    text_byte = text.encode("utf8")
+    new_end_byte = start_byte + len(text_byte)
+    new_lines = text_byte.count(b"\n")
+    if new_lines:
+        new_end_point = (
+            start_line + new_lines,
+            len(text_byte) - text_byte.rfind(b"\n") - 1,
+        )
+    else:
+        new_end_point = (start_line, start_column + len(text_byte))
+    new_source_byte = (
+        old_source_byte[:start_byte] + text_byte + old_source_byte[old_end_byte:]
+    )
+    edit = {
+        "start_byte": start_byte,
+        "old_end_byte": old_end_byte,
+        "new_end_byte": new_end_byte,
+        "start_point": (start_line, start_column),
+        "old_end_point": (end_line, old_end_column),
+        "new_end_point": new_end_point,
     }
+    return edit, new_source_byte
+
+
+class EditableTree(object):
+    """the tree-sitter tree of a document, the content changes are applied to the tree by `Tree.edit`, so the next parse only reparses the changed part
+
+    The returned tree is never edited, the changes are applied to a copy of it.
+    """
+
+    def __init__(self, parser: Any):
+        """
+        Args:
+            parser: the JsonParser or YamlParser
+        """
+        super(EditableTree, self).__init__()
+        self.parser = parser
+        self.tree: Optional[Tree] = None
+        # the source which the (edited) tree describes
+        self.source_byte = b""
+        self.edited = False
+
+    def apply_change(self, change: Any) -> None:
+        """apply the LSP content change to the tree
+
+        Args:
+            change: the `TextDocumentContentChangeEvent`, the change without range replaces the whole document
+
+        Returns:
+            None
+        """
+        if self.tree is None:
+            return
+        if getattr(change, "range", None) is None:
+            new_source_byte = change.text.encode("utf8")
+            edit = get_change(self.source_byte, new_source_byte)
+        else:
+            edit, new_source_byte = get_edit(
+                self.source_byte, change.range, change.text
+            )
+        if not self.edited:
+            # the returned tree may be still used(the converted tree reads the nodes lazily), so edit a copy of it, reparse without the change only takes a few microseconds
+            self.tree = self.parser.parse(self.source_byte, self.tree)
+        self.tree.edit(**edit)
+        self.source_byte = new_source_byte
+        self.edited = True
+
+    def parse(self, source: str, track: bool = True) -> Tree:
+        """get the tree of the source, reparse incrementally if the source is the edited source
+
+        Args:
+            source: the source document
+            track: whether the source is the document source, the untracked source(like the temporary source for completion) is parsed without changing the kept tree
+
+        Returns:
+            the tree-sitter tree
+        """
+        source_byte = source.encode("utf8")
+        if self.tree is not None and source_byte == self.source_byte:
+            if self.edited:
+                self.tree = self.parser.parse(source_byte, self.tree)
+                self.edited = False
+            return self.tree
+        if not track:
+            return self.parser.parse(source_byte)
+        # the kept tree is missing or out of sync with the document, parse from scratch
+        self.tree = self.parser.parse(source_byte)
+        self.source_byte = source_byte
+        self.edited = False
+        return self.tree
 
 
 if __name__ == "__main__":
@@ -7,7 +7,9 @@ import os
 import sys
 from typing import Dict, List, Optional, Union
 
-from tree_sitter import Language, Node, Parser
+from tree_sitter import Language, Node, Parser, Tree
+
+from intc_lsp.src.view import NodeView
 
 if sys.platform == "win32":
     sys_post_fix = "win"
@@ -43,6 +45,20 @@ class JsonParser(object):
         """
         return self.parser_object(self._parser.parse(bytes(doc, "utf8")).root_node)
 
+    def parse(self, source: bytes, old_tree: Optional[Tree] = None) -> Tree:
+        """parse the source to the tree-sitter tree
+
+        Args:
+            source: the utf-8 source document
+            old_tree: the old tree edited by `Tree.edit`, the unchanged nodes are reused
+
+        Returns:
+            the tree-sitter tree
+        """
+        if old_tree is None:
+            return self._parser.parse(source)
+        return self._parser.parse(source, old_tree)
+
     @staticmethod
     def print_parser_tree(node: Node, deep=0) -> None:
         for children in node.named_children:
@@ -60,18 +76,19 @@ class JsonParser(object):
         return text
 
     def parser_pair(self, node: Node, deep: int) -> Dict:
-        key = self.parser_object(node.named_children[0])
-
-        if len(node.named_children) == 2:
-            value = self.parser_object(node.named_children[1])
-        else:
-            value = None
-        result = {}
-        result["__type"] = "pair"
-        result["__range"] = (node.start_point, node.end_point)
-        result["__value"] = value
-        result["__key"] = key
-        return result
+        def _value():
+            if node.named_child_count == 2:
+                return self.parser_object(node.named_children[1])
+            return None
+
+        return NodeView(
+            "pair",
+            (node.start_point, node.end_point),
+            {
+                "__value": _value,
+                "__key": lambda: self.parser_object(node.named_children[0]),
+            },
+        )
 
     def parser_string(self, node: Node, deep: int) -> Dict:
         return {
@@ -88,11 +105,22 @@ class JsonParser(object):
         }
 
     def parser_array(self, node: Node, deep: int) -> Dict:
-        return {
-            "__type": "array",
-            "__value": [self.parser_object(child) for child in node.named_children],
-            "__range": (node.start_point, node.end_point),
-        }
+        return NodeView(
+            "array",
+            (node.start_point, node.end_point),
+            {
+                "__value": lambda: [
+                    self.parser_object(child) for child in node.named_children
+                ]
+            },
+        )
+
+    def parser_document(self, node: Node, deep: int) -> Dict:
+        return NodeView(
+            "document",
+            (node.start_point, node.end_point),
+            {"__value": lambda: self.parser_object(node, deep + 1)},
+        )
 
     def parser_null_true_false(self, node: Node, deep: int):
         return {
@@ -102,23 +130,33 @@ class JsonParser(object):
         }
 
     def parser_object(self, node, deep=0):
-        if node.type in self.skip:
+        """convert the node to the dict tree, the pair, array and document are converted to the `NodeView`, their children are converted on the first access
+
+        Args:
+            node: the tree-sitter node
+            deep: the depth of the node
+
+        Returns:
+            the converted tree
+        """
+        node_type = node.type
+        if node_type in self.skip:
             return None
-        if node.type == "pair":
+        if node_type == "pair":
             return self.parser_pair(node, deep + 1)
-        if node.type == "string":
+        if node_type == "string":
             return self.parser_string(node, deep + 1)
 
-        if node.type == "number":
+        if node_type == "number":
             return self.parser_number(node, deep + 1)
 
-        if node.type == "array":
+        if node_type == "array":
             return self.parser_array(node, deep + 1)
 
-        if node.type in {"null", "bool"}:
+        if node_type in {"null", "bool"}:
             return self.parser_null_true_false(node, deep + 1)
 
-        if node.type == "object":
+        if node_type == "object":
             values = []
             for child in node.named_children:
                 if child.type in self.skip:
@@ -127,36 +165,24 @@ class JsonParser(object):
                 if value:
                     values.append(value)
             return values
-        if node.type == "document":
+        if node_type == "document":
             result = []
             for child in node.named_children:
                 if child.type in self.skip:
                     continue
-                result.append(
-                    {
-                        "__type": "document",
-                        "__value": self.parser_object(child, deep + 1),
-                        "__range": (child.start_point, child.end_point),
-                    }
-                )
+                result.append(self.parser_document(child, deep))
             return result
-        if node.type != "ERROR":
+        if node_type != "ERROR":
             result = []
             for child in node.named_children:
                 if child.type in self.skip:
                     continue
-                result.append(
-                    {
-                        "__type": "document",
-                        "__value": self.parser_object(child, deep + 1),
-                        "__range": (child.start_point, child.end_point),
-                    }
-                )
+                result.append(self.parser_document(child, deep))
             return result
         return {
             "__type": "error",
             "__range": (node.start_point, node.end_point),
-            "__meta": {"type": node.type, "text": node.text.decode()},
+            "__meta": {"type": node_type, "text": node.text.decode()},
         }
 
 
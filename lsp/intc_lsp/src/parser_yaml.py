@@ -7,7 +7,9 @@ import os
 import sys
 from typing import Dict, List, Optional, Union
 
-from tree_sitter import Language, Node, Parser
+from tree_sitter import Language, Node, Parser, Tree
+
+from intc_lsp.src.view import NodeView
 
 if sys.platform == "win32":
     sys_post_fix = "win"
@@ -41,6 +43,20 @@ class YamlParser(object):
         """
         return self.parser_object(self._parser.parse(bytes(doc, "utf8")).root_node)
 
+    def parse(self, source: bytes, old_tree: Optional[Tree] = None) -> Tree:
+        """parse the source to the tree-sitter tree
+
+        Args:
+            source: the utf-8 source document
+            old_tree: the old tree edited by `Tree.edit`, the unchanged nodes are reused
+
+        Returns:
+            the tree-sitter tree
+        """
+        if old_tree is None:
+            return self._parser.parse(source)
+        return self._parser.parse(source, old_tree)
+
     @staticmethod
     def print_parser_tree(node: Node, deep=0) -> None:
         for children in node.named_children:
@@ -58,19 +74,20 @@ class YamlParser(object):
         return text
 
     def parser_pair(self, node: Node, deep: int) -> Dict:
-        key = self.parser_object(node.named_children[0])
-        key = self.parser_object(node.named_children[0], deep + 1)
-        if len(node.named_children) == 2:
-            value = self.parser_object(node.named_children[1], deep + 1)
-        else:
-            assert len(node.named_children) == 1
-            value = None
-        result = {}
-        result["__type"] = "pair"
-        result["__range"] = (node.start_point, node.end_point)
-        result["__value"] = value
-        result["__key"] = key
-        return result
+        def _value():
+            if node.named_child_count == 2:
+                return self.parser_object(node.named_children[1], deep + 1)
+            assert node.named_child_count == 1
+            return None
+
+        return NodeView(
+            "pair",
+            (node.start_point, node.end_point),
+            {
+                "__value": _value,
+                "__key": lambda: self.parser_object(node.named_children[0], deep + 1),
+            },
+        )
 
     def parser_flow_node(self, node: Node, deep: int):
         assert len(node.named_children) == 1, node.named_children
@@ -97,11 +114,33 @@ class YamlParser(object):
         }
 
     def parser_array(self, node: Node, deep: int) -> Dict:
-        return {
-            "__type": "array",
-            "__value": [self.parser_object(child) for child in node.named_children],
-            "__range": (node.start_point, node.end_point),
-        }
+        return NodeView(
+            "array",
+            (node.start_point, node.end_point),
+            {
+                "__value": lambda: [
+                    self.parser_object(child) for child in node.named_children
+                ]
+            },
+        )
+
+    def parser_block_sequence(self, node: Node, deep: int) -> Dict:
+        return NodeView(
+            "array",
+            (node.start_point, node.end_point),
+            {
+                "__value": lambda: [
+                    self.parser_object(child, deep) for child in node.named_children
+                ]
+            },
+        )
+
+    def parser_document(self, node: Node, deep: int) -> Dict:
+        return NodeView(
+            "document",
+            (node.start_point, node.end_point),
+            {"__value": lambda: self.parser_object(node, deep + 1)},
+        )
 
     def parser_block_node(self, node: Node, deep: int):
         assert len(node.named_children) == 1, node.named_children
@@ -119,43 +158,53 @@ class YamlParser(object):
         }
 
     def parser_object(self, node: Node, deep: int = 0):
-        if deep == 0 and node.type == "ERROR":
+        """convert the node to the dict tree, the pair, array and document are converted to the `NodeView`, their children are converted on the first access
+
+        Args:
+            node: the tree-sitter node
+            deep: the depth of the node
+
+        Returns:
+            the converted tree
+        """
+        node_type = node.type
+        if deep == 0 and node_type == "ERROR":
             parser_childs = [
                 self.parser_object(child)
                 for child in node.named_children
                 if child.type not in self.skip
             ]
             return parser_childs
-        if node.type in self.skip:
+        if node_type in self.skip:
             return None
-        if node.type == "block_mapping_pair":
+        if node_type == "block_mapping_pair":
             return self.parser_pair(node, deep + 1)
 
-        if node.type == "flow_sequence":
+        if node_type == "flow_sequence":
             return self.parser_array(node, deep + 1)
-        if node.type == "plain_scalar":
+        if node_type == "plain_scalar":
             return self.parser_plain_scalar(node, deep + 1)
-        if node.type == "flow_node":
+        if node_type == "flow_node":
             return self.parser_flow_node(node, deep + 1)
-        if node.type in {"string_scalar", "double_quote_scalar", "single_quote_scalar"}:
+        if node_type in {"string_scalar", "double_quote_scalar", "single_quote_scalar"}:
             return self.parser_string(node, deep + 1)
 
-        if node.type in {"integer_scalar", "float_scalar"}:
+        if node_type in {"integer_scalar", "float_scalar"}:
             return self.parser_number(node, deep + 1)
 
-        if node.type in {"boolean_scalar", "null_scalar"}:
+        if node_type in {"boolean_scalar", "null_scalar"}:
             return self.parser_null_true_false(node, deep + 1)
 
-        if node.type == "stream":
+        if node_type == "stream":
             for child in node.named_children:
                 result = self.parser_object(child, deep + 1)
                 if result is not None:
                     return result
             return {}
 
-        if node.type == "block_node":
+        if node_type == "block_node":
             return self.parser_block_node(node, deep + 1)
-        if node.type == "block_mapping":
+        if node_type == "block_mapping":
             values = []
             for child in node.named_children:
                 if child.type in self.skip:
@@ -165,29 +214,17 @@ class YamlParser(object):
                     values.append(value)
             return values
 
-        if node.type == "block_sequence":
-            return {
-                "__type": "array",
-                "__value": [
-                    self.parser_object(child, deep) for child in node.named_children
-                ],
-                "__range": (node.start_point, node.end_point),
-            }
-        if node.type == "block_sequence_item":
+        if node_type == "block_sequence":
+            return self.parser_block_sequence(node, deep)
+        if node_type == "block_sequence_item":
             return self.parser_object(node.named_children[0], deep + 1)
 
-        if node.type == "document":
+        if node_type == "document":
             result = []
             for child in node.named_children:
                 if child.type in self.skip:
                     continue
-                result.append(
-                    {
-                        "__type": "document",
-                        "__value": self.parser_object(child, deep + 1),
-                        "__range": (child.start_point, child.end_point),
-                    }
-                )
+                result.append(self.parser_document(child, deep))
             return result
         return {}
 
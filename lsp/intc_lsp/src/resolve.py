@@ -7,6 +7,7 @@ import json
 import logging
 import pathlib
 import re
+import threading
 import urllib
 from enum import Enum
 from functools import lru_cache
@@ -33,6 +34,8 @@ from pygls.server import LanguageServer
 
 logger = logging.getLogger("intc_lsp")
 try:
+    from intc_lsp.src.cache import DocumentCache
+    from intc_lsp.src.edit import EditableTree
     from intc_lsp.src.parser_json import JsonParser
     from intc_lsp.src.parser_yaml import YamlParser
     from intc_lsp.src.trace import root_trace
@@ -274,6 +277,10 @@ class IntcResolve(object):
         self.json_parser: JsonParser = None
         self.yaml_parser: YamlParser = None
         self.reserved_words = {"_base", "_name", "_anchor", "_search", "_G"}
+        # the tree-sitter tree(reparsed incrementally after the changes) and the results of the current version of every opened document
+        self.documents = DocumentCache()
+        # the diagnostics run in the worker thread, the lock guards the document cache
+        self.lock = threading.RLock()
 
         try:
             self.json_parser = JsonParser()
@@ -290,7 +297,7 @@ class IntcResolve(object):
         self, uri: str, source: str, position: Position, include_all: bool = True
     ) -> Optional[Tuple[str, Range]]:
         if source is None:
-            source = self.server.workspace.get_document(uri).source
+            source = self.server.workspace.get_text_document(uri).source
 
         def _cursor_line() -> str:
             line = source.split("\n")[position.line]
@@ -359,7 +366,7 @@ class IntcResolve(object):
             completions items
         """
         items = []
-        source = self.server.workspace.get_document(uri).source
+        source = self.server.workspace.get_text_document(uri).source
 
         def _update_source(source):
             lines = source.split("\n")
@@ -390,7 +397,7 @@ class IntcResolve(object):
         module_type, is_entry = get_module_type_by_uri(self.server, uri)
         logger.info(f"uri: {uri}. module_type: {module_type}")
         parser_result = self.parser_cursor(
-            parser_tree, position, module_type, source, is_entry
+            parser_tree, position, module_type, source, is_entry, uri
         )
 
         logger.info(f"completions parser_result : {parser_result}")
@@ -653,12 +660,12 @@ class IntcResolve(object):
             return []
 
         if source is None:
-            source = self.server.workspace.get_document(uri).source
+            source = self.server.workspace.get_text_document(uri).source
         parser_tree = self.parser_tree(uri, source)
         module_type, is_entry = get_module_type_by_uri(self.server, uri)
         logger.info(f"uri: {uri}. module_type: {module_type}")
         parser_result = self.parser_cursor(
-            parser_tree, position, module_type, source, is_entry
+            parser_tree, position, module_type, source, is_entry, uri
         )
 
         if parser_result.semantic_trace is None:
@@ -736,11 +743,11 @@ class IntcResolve(object):
                 ),
             }
         if source is None:
-            source = self.server.workspace.get_document(uri).source
+            source = self.server.workspace.get_text_document(uri).source
         parser_tree = self.parser_tree(uri, source)
         module_type, is_entry = get_module_type_by_uri(self.server, uri)
         parser_result = self.parser_cursor(
-            parser_tree, position, module_type, source, is_entry
+            parser_tree, position, module_type, source, is_entry, uri
         )
         if parser_result.semantic_trace is None:
             logger.error(f"hover parser_result : {parser_result}")
@@ -909,7 +916,6 @@ class IntcResolve(object):
         ignore_keys = {"_anchor", "_G", "_search", "_base"}
         iter_fileds = {"NestField", "SubModule", "ModuleField"}
 
-        @lru_cache(maxsize=64)
         def _(source, uri):
             tree = self.parser_tree(uri, source)
 
@@ -1174,8 +1180,27 @@ class IntcResolve(object):
 
             return _resolve_tree(tree)
 
-        source = self.server.workspace.get_document(uri).source
-        return _(source, uri)
+        document = self.server.workspace.get_text_document(uri)
+        # the diagnostics also depend on the registered modules
+        diagnostics_key = ic_repo.version
+        with self.lock:
+            state = self.documents.get(uri)
+            if state.at_version(document.version):
+                if (
+                    state.diagnostics is not None
+                    and state.diagnostics_key == diagnostics_key
+                ):
+                    return state.diagnostics
+        diagnostics = _(document.source, uri)
+        with self.lock:
+            # the document may be changed while resolving
+            current = self.server.workspace.get_text_document(uri)
+            if current.version == document.version and state.at_version(
+                document.version
+            ):
+                state.diagnostics = diagnostics
+                state.diagnostics_key = diagnostics_key
+        return diagnostics
 
     def parser_tree(self, uri: str, source: str = ""):
         """parser the source to AST
@@ -1189,35 +1214,78 @@ class IntcResolve(object):
         Returns:
             the parser tree
         """
+        with self.lock:
+            return self._parser_tree(uri, source)
 
-        @lru_cache(maxsize=128)
-        def _(uri, source):
-            if source is None:
-                source = self.server.workspace.get_document(uri).source
-            if (
-                uri.endswith(".json")
-                or uri.endswith(".jsonc")
-                or uri.endswith(".json5")
-                or uri.endswith(".hjson")
-            ):
-                try:
-                    parser_tree = self.json_parser.parser(source)
-                    return parser_tree
-                except Exception as e:
-                    logger.error(f"parser tree: json parser error : {e}")
-                    return {}
-            elif uri.endswith(".yaml") or uri.endswith(".yml"):
-                try:
-                    parser_tree = self.yaml_parser.parser(source)
-                    return parser_tree
-                except Exception as e:
-                    logger.error(f"parser tree: yaml parser error : {e}")
-                    return {}
-            else:
-                logger.warning(f"not support file type {uri}")
-                return {}
+    def _parser_tree(self, uri: str, source: str):
+        """the `parser_tree` without the lock"""
+        document = self.server.workspace.get_text_document(uri)
+        if source is None:
+            source = document.source
+        # only the document source is cached and kept for the incremental parsing
+        track = source is document.source or source == document.source
+        state = self.documents.get(uri)
+        if track and state.at_version(document.version):
+            if state.parser_tree is not None:
+                return state.parser_tree
+        if (
+            uri.endswith(".json")
+            or uri.endswith(".jsonc")
+            or uri.endswith(".json5")
+            or uri.endswith(".hjson")
+        ):
+            parser = self.json_parser
+        elif uri.endswith(".yaml") or uri.endswith(".yml"):
+            parser = self.yaml_parser
+        else:
+            logger.warning(f"not support file type {uri}")
+            return {}
+        try:
+            if state.tree is None:
+                state.tree = EditableTree(parser)
+            tree = state.tree.parse(source, track=track)
+            parser_tree = parser.parser_object(tree.root_node)
+        except Exception as e:
+            logger.error(f"parser tree: parser {uri} error : {e}")
+            return {}
+        if track and state.at_version(document.version):
+            state.parser_tree = parser_tree
+        return parser_tree
+
+    def update_document(self, uri: str, changes: List[Any]) -> None:
+        """apply the content changes to the kept tree of the document, so the next parse is incremental
 
-        return _(uri, source)
+        Args:
+            uri: the file uri
+            changes: the `TextDocumentContentChangeEvent` list of the `didChange` notification
+
+        Returns:
+            None
+        """
+        with self.lock:
+            if uri not in self.documents:
+                return
+            state = self.documents.get(uri)
+            if state.tree is None:
+                return
+            try:
+                for change in changes:
+                    state.tree.apply_change(change)
+            except Exception as e:
+                logger.error(f"update document: apply the change to {uri} error : {e}")
+                state.tree = None
+
+    def close_document(self, uri: str) -> None:
+        """drop the kept tree and the cached results of the closed document
+
+        Args:
+            uri: the file uri
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.documents.pop(uri)
 
     def parser_cursor(
         self,
@@ -1226,6 +1294,7 @@ class IntcResolve(object):
         module_type_from_uri: str,
         source: str,
         is_entry: bool,
+        uri: str = "",
     ) -> ParseResult:
         """parser the source to AST, and get the cursor position node information, and the trace information
         Args:
@@ -1233,13 +1302,13 @@ class IntcResolve(object):
             position: (line, character)
             module_type_from_uri: the module type detected from the uri
             is_entry: True means the file is a entry module, False means is a submodule
+            uri: the file uri, if the parser_tree is the cached tree of the document, the result is cached and the position index of the tree is reused
         Returns:
             the ParseResult object
         """
         _position: tuple = (position.line, position.character)
 
-        @lru_cache(maxsize=128)
-        def wrap(source, _position, module_type_from_uri, is_entry):
+        def wrap(source, _position, module_type_from_uri, is_entry, index=None):
             result = {"is_entry": is_entry}
             result["parser_tree"] = parser_tree
             try:
@@ -1250,7 +1319,7 @@ class IntcResolve(object):
                     is_key_or_none,
                     anchor_dict,
                     additional,
-                ) = root_trace(parser_tree, _position, module_type_from_uri)
+                ) = root_trace(parser_tree, _position, module_type_from_uri, index)
             except Exception as e:
                 logger.error(f"hover: error : {e}")
                 return ParseResult(**result)
@@ -1262,7 +1331,22 @@ class IntcResolve(object):
             result["additional"] = additional
             return ParseResult(**result)
 
-        return wrap(source, _position, module_type_from_uri, is_entry)
+        with self.lock:
+            state = self.documents.get(uri) if uri in self.documents else None
+            if state is None or state.parser_tree is not parser_tree:
+                return wrap(source, _position, module_type_from_uri, is_entry)
+            key = (_position, module_type_from_uri, is_entry)
+            result = state.get_cursor(key)
+            if result is None:
+                result = wrap(
+                    source,
+                    _position,
+                    module_type_from_uri,
+                    is_entry,
+                    state.trace_index,
+                )
+                state.set_cursor(key, result)
+            return result
 
 
 if __name__ == "__main__":
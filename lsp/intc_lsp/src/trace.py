@@ -4,9 +4,13 @@
 # LICENSE file in the root directory of this source tree.
 
 import logging
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger("intc_lsp")
 
+SPECIAL_KEYS = {"_name", "_base", "_anchor"}
+
 
 def position_is_in_range(position_range: tuple, position: tuple) -> bool:
     """Check if a given position is within a specified range.
@@ -18,18 +22,134 @@ def position_is_in_range(position_range: tuple, position: tuple) -> bool:
     Returns:
         bool: True if the position is within the range, False otherwise.
     """
-    range_start = position_range[0][0] * 1e8 + position_range[0][1]
-    range_end = position_range[1][0] * 1e8 + position_range[1][1]
-    position = position[0] * 1e8 + position[1]
-    return position >= range_start and position < range_end
+    start, end = position_range
+    position = (position[0], position[1])
+    return (start[0], start[1]) <= position < (end[0], end[1])
+
+
+class TraceIndex(object):
+    """The position index of a parsed tree.
+
+    The sorted ranges of the children of every visited node are built on the first lookup, so finding the child at a position is a bisect instead of a scan over all the children. The index is only valid for the tree it is used with, drop it when the tree changes.
+    """
+
+    def __init__(self):
+        super(TraceIndex, self).__init__()
+        # id(children) -> (children, starts, ends, special_indexes), the children is kept to make sure the id is not reused
+        self.nodes: Dict[int, Tuple[list, Optional[list], Optional[list], list]] = {}
+
+    def _build(self, children: list) -> Tuple:
+        """Build the index of the children.
+
+        Args:
+            children: The children of a node.
+
+        Returns:
+            tuple: The children, the sorted start and end positions(None if the ranges are not sorted or overlapped) and the indexes of the `_name`, `_base` and `_anchor` pairs.
+        """
+        starts: Optional[List[tuple]] = []
+        ends: Optional[List[tuple]] = []
+        special_indexes = []
+        for i, child in enumerate(children):
+            if not isinstance(child, dict):
+                starts = ends = None
+                continue
+            if (
+                child.get("__type", None) == "pair"
+                and isinstance(child.get("__key", None), dict)
+                and child["__key"].get("__value", "") in SPECIAL_KEYS
+            ):
+                special_indexes.append(i)
+            if starts is None or "__range" not in child:
+                starts = ends = None
+                continue
+            start, end = child["__range"]
+            start, end = (start[0], start[1]), (end[0], end[1])
+            if ends and start < ends[-1]:
+                starts = ends = None
+                continue
+            starts.append(start)
+            ends.append(end)
+        return children, starts, ends, special_indexes
+
+    def get(self, children: list) -> Tuple:
+        """Get the index of the children, build it if not exists.
+
+        Args:
+            children: The children of a node.
+
+        Returns:
+            tuple: The index of the children.
+        """
+        key = id(children)
+        if key not in self.nodes:
+            self.nodes[key] = self._build(children)
+        return self.nodes[key]
+
+    def children_in_range(self, children: list, position: tuple) -> List[int]:
+        """Find the children which contain the position.
+
+        Args:
+            children: The children of a node.
+            position: The position to trace.
+
+        Returns:
+            list: The indexes of the children.
+        """
+        _, starts, ends, _ = self.get(children)
+        if starts is None:
+            return [
+                i
+                for i, child in enumerate(children)
+                if position_is_in_range(child["__range"], position)
+            ]
+        position = (position[0], position[1])
+        i = bisect_right(starts, position) - 1
+        if i >= 0 and position < ends[i]:
+            return [i]
+        return []
+
+    def special_children(self, children: list) -> List[int]:
+        """Find the `_name`, `_base` and `_anchor` pairs in the children.
+
+        Args:
+            children: The children of a node.
+
+        Returns:
+            list: The indexes of the pairs.
+        """
+        return self.get(children)[3]
+
+
+def children_in_range(
+    children: list, position: tuple, index: Optional[TraceIndex]
+) -> List[int]:
+    """Find the children which contain the position, scan all the children if the index is not provided.
+
+    Args:
+        children: The children of a node.
+        position: The position to trace.
+        index: The position index of the tree.
+
+    Returns:
+        list: The indexes of the children.
+    """
+    if index is not None:
+        return index.children_in_range(children, position)
+    return [
+        i
+        for i, child in enumerate(children)
+        if position_is_in_range(child["__range"], position)
+    ]
 
 
-def root_trace(result, position, trace="") -> tuple:
+def root_trace(result, position, trace="", index: TraceIndex = None) -> tuple:
     """Trace the root of a tree structure based on a given position.
 
     Args:
         result: The result of the tracing process.
         position: The position to trace.
+        index: The position index of the result, reuse it for the same result to avoid scanning all the nodes.
 
     Returns:
         tuple: A tuple containing the semantic trace, lexical trace, trace value, a flag indicating if the position matches the key or value, anchor dictionary, and additional information.
@@ -38,9 +158,9 @@ def root_trace(result, position, trace="") -> tuple:
     additional = {}
     if not result:
         return None, None, None, None, anchor_dict, additional
-    for node in result:
+    for i in children_in_range(result, position, index):
         semantic_trace, lex_trace, trace_result, is_key_or_none = node_trace(
-            node, position, anchor_dict, additional, trace
+            result[i], position, anchor_dict, additional, trace, index
         )
         if is_key_or_none is not None:
             return (
@@ -55,7 +175,12 @@ def root_trace(result, position, trace="") -> tuple:
 
 
 def node_trace_document(
-    node, position, anchor_dict: dict, additional: dict, trace: str = ""
+    node,
+    position,
+    anchor_dict: dict,
+    additional: dict,
+    trace: str = "",
+    index: TraceIndex = None,
 ):
     """Trace a document node in a tree structure based on a given position.
 
@@ -65,6 +190,7 @@ def node_trace_document(
         anchor_dict: A dictionary to store anchor names and their corresponding traces.
         additional: Additional information to be passed along during the tracing process.
         trace: The current trace string. Defaults to an empty string.
+        index: The position index of the tree. Defaults to None, scan all the children.
 
     Returns:
         tuple: A tuple containing the semantic trace, lexical trace, trace value, and a flag indicating if the position matches the key or value.
@@ -72,22 +198,32 @@ def node_trace_document(
     if not position_is_in_range(node["__range"], position):
         return None, None, None, None
     if trace:
+        # trace the document as a pair, copy the node to keep the (cached) tree unchanged
+        node = dict(node)
         node["__type"] = "pair"
         node["__key"] = {
             "__type": "string",
             "__value": f"@{trace.lstrip('@')}",
             "__range": ((-1, -1), (-1, -1)),
         }
-        return node_trace_pair(node, position, anchor_dict, additional, trace)
-    for value in node["__value"]:
-        value_result = node_trace(value, position, anchor_dict, additional, trace)
+        return node_trace_pair(node, position, anchor_dict, additional, trace, index)
+    values = node["__value"]
+    for i in children_in_range(values, position, index):
+        value_result = node_trace(
+            values[i], position, anchor_dict, additional, trace, index
+        )
         if value_result[3] is not None:
             return value_result
     return None, None, None, None
 
 
 def node_trace(
-    node, position, anchor_dict: dict, additional: dict, trace: str = ""
+    node,
+    position,
+    anchor_dict: dict,
+    additional: dict,
+    trace: str = "",
+    index: TraceIndex = None,
 ) -> tuple:
     """Trace a node in a tree structure based on a given position.
 
@@ -97,22 +233,30 @@ def node_trace(
         anchor_dict: A dictionary to store anchor names and their corresponding traces.
         additional: Additional information to be passed along during the tracing process.
         trace: The current trace string. Defaults to an empty string.
+        index: The position index of the tree. Defaults to None, scan all the children.
 
     Returns:
         tuple: A tuple containing the semantic trace, lexical trace, trace value, and a flag indicating if the position matches the key or value.
     """
     if node.get("__type", None) == "pair":
-        return node_trace_pair(node, position, anchor_dict, additional, trace)
+        return node_trace_pair(node, position, anchor_dict, additional, trace, index)
     elif node.get("__type", None) == "document":
-        return node_trace_document(node, position, anchor_dict, additional, trace)
+        return node_trace_document(
+            node, position, anchor_dict, additional, trace, index
+        )
     elif node.get("__type", None) == "array":
-        return node_trace_array(node, position, anchor_dict, additional, trace)
+        return node_trace_array(node, position, anchor_dict, additional, trace, index)
     else:
-        return node_trace_other(node, position, anchor_dict, additional, trace)
+        return node_trace_other(node, position, anchor_dict, additional, trace, index)
 
 
 def node_trace_other(
-    node, position, anchor_dict: dict, additional: dict, trace: str = ""
+    node,
+    position,
+    anchor_dict: dict,
+    additional: dict,
+    trace: str = "",
+    index: TraceIndex = None,
 ) -> tuple:
     """Trace a node of type other in a tree structure based on a given position.
 
@@ -122,6 +266,7 @@ def node_trace_other(
         anchor_dict: A dictionary to store anchor names and their corresponding traces.
         additional: Additional information to be passed along during the tracing process.
         trace: The current trace string. Defaults to an empty string.
+        index: The position index of the tree. Defaults to None, scan all the children.
 
     Returns:
         tuple: A tuple containing the semantic trace, lexical trace, trace value, and a flag indicating if the position matches the key or value.
@@ -132,7 +277,12 @@ def node_trace_other(
 
 
 def node_trace_array(
-    node, position, anchor_dict: dict, additional: dict, trace: str = ""
+    node,
+    position,
+    anchor_dict: dict,
+    additional: dict,
+    trace: str = "",
+    index: TraceIndex = None,
 ):
     """Trace an array node in a tree structure based on a given position.
 
@@ -142,17 +292,17 @@ def node_trace_array(
         anchor_dict: A dictionary to store anchor names and their corresponding traces.
         additional: Additional information to be passed along during the tracing process.
         trace: The current trace string. Defaults to an empty string.
+        index: The position index of the tree. Defaults to None, scan all the children.
 
     Returns:
         tuple: A tuple containing the semantic trace, lexical trace, trace value, and a flag indicating if the position matches the key or value.
     """
     if not position_is_in_range(node["__range"], position):
         return None, None, None, None
-    for i, child in enumerate(node["__value"]):
-        if not position_is_in_range(child["__range"], position):
-            continue
+    children = node["__value"]
+    for i in children_in_range(children, position, index):
         semantic_trace, lex_trace, trace_value, is_key_or_none = node_trace(
-            child, position, anchor_dict, additional, trace + f".{i}"
+            children[i], position, anchor_dict, additional, trace + f".{i}", index
         )
         if semantic_trace:
             return (
@@ -165,7 +315,12 @@ def node_trace_array(
 
 
 def node_trace_pair(
-    node, position, anchor_dict: dict, additional: dict, trace: str = ""
+    node,
+    position,
+    anchor_dict: dict,
+    additional: dict,
+    trace: str = "",
+    index: TraceIndex = None,
 ):
     """Trace a pair node in a tree structure based on a given position.
 
@@ -175,6 +330,7 @@ def node_trace_pair(
         anchor_dict: A dictionary to store anchor names and their corresponding traces.
         additional: Additional information to be passed along during the tracing process.
         trace: The current trace string. Defaults to an empty string.
+        index: The position index of the tree. Defaults to None, scan all the children.
 
     Returns:
         tuple: A tuple containing the semantic trace, lexical trace, trace value, and a flag indicating if the position matches the key or value.
@@ -209,7 +365,12 @@ def node_trace_pair(
     sub_modules = node.get("__value", [])
     if isinstance(sub_modules, dict):
         semantic_trace, lex_trace, trace_value, is_key_or_none = node_trace(
-            sub_modules, position, anchor_dict, additional, trace + "." + module_name
+            sub_modules,
+            position,
+            anchor_dict,
+            additional,
+            trace + "." + module_name,
+            index,
         )
         if not on_module_root:
             if is_key_or_none is not None:
@@ -223,7 +384,17 @@ def node_trace_pair(
                 )
             return None, None, None, None
     assert isinstance(sub_modules, list), sub_modules
-    for sub_module in sub_modules:
+    if index is None:
+        visit_indexes = range(len(sub_modules))
+    else:
+        # only the children at the position and the `_name`, `_base` and `_anchor` pairs of the module affect the result
+        visit_indexes = index.children_in_range(sub_modules, position)
+        if is_module:
+            visit_indexes = sorted(
+                set(visit_indexes) | set(index.special_children(sub_modules))
+            )
+    for i in visit_indexes:
+        sub_module = sub_modules[i]
         if (
             is_module
             and sub_module.get("__type", None) == "pair"
@@ -250,7 +421,12 @@ def node_trace_pair(
                 )
         if position_is_in_range(sub_module["__range"], position):
             semantic_trace, lex_trace, trace_value, is_key_or_none = node_trace(
-                sub_module, position, anchor_dict, additional, trace + "." + module_name
+                sub_module,
+                position,
+                anchor_dict,
+                additional,
+                trace + "." + module_name,
+                index,
             )
     if not on_module_root:
         if is_key_or_none is not None:
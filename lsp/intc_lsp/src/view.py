@@ -0,0 +1,106 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+from typing import Any, Callable, Dict, Tuple
+
+
+class NodeView(dict):
+    """the dict view of a tree-sitter node, the `__type` and `__range` are set when creating, the other fields(like `__key`, `__value`) are converted from the node on the first access
+
+    The view can be used as the converted dict, the iteration, comparison and copy convert all the fields(not recursively, the children are also views).
+    """
+
+    __slots__ = ("_loaders",)
+
+    def __init__(
+        self,
+        node_type: str,
+        node_range: Tuple,
+        loaders: Dict[str, Callable[[], Any]],
+    ):
+        """
+        Args:
+            node_type: the `__type` of the node
+            node_range: the `__range` of the node, ((start_row, start_col), (end_row, end_col))
+            loaders: field name -> the function to convert the field
+        """
+        super(NodeView, self).__init__()
+        dict.__setitem__(self, "__type", node_type)
+        dict.__setitem__(self, "__range", node_range)
+        self._loaders = loaders
+
+    def __missing__(self, key: str) -> Any:
+        loader = self._loaders.get(key, None)
+        if loader is None:
+            raise KeyError(key)
+        # the view may be accessed by the diagnostics worker at the same time, keep the first converted value
+        value = dict.setdefault(self, key, loader())
+        self._loaders.pop(key, None)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._loaders.pop(key, None)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._loaders:
+            self._loaders.pop(key)
+            return
+        dict.__delitem__(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or key in self._loaders
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        return default
+
+    def load(self) -> "NodeView":
+        """convert all the fields of the node
+
+        Returns:
+            self
+        """
+        for key in list(self._loaders):
+            self[key]
+        return self
+
+    def __iter__(self):
+        return dict.__iter__(self.load())
+
+    def __len__(self) -> int:
+        return dict.__len__(self) + len(self._loaders)
+
+    def keys(self):
+        return dict.keys(self.load())
+
+    def values(self):
+        return dict.values(self.load())
+
+    def items(self):
+        return dict.items(self.load())
+
+    def copy(self) -> Dict:
+        return dict(self.load())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, NodeView):
+            other.load()
+        return dict.__eq__(self.load(), other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
+
+    def __repr__(self) -> str:
+        # do not convert the fields for the repr, the parser tree is logged frequently
+        fields = [f"{key!r}: {value!r}" for key, value in dict.items(self)]
+        fields.extend(f"{key!r}: <lazy>" for key in self._loaders)
+        return "{" + ", ".join(fields) + "}"
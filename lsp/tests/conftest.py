@@ -0,0 +1,48 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+import re
+from types import SimpleNamespace
+
+import pytest
+from lsprotocol.types import (
+    TextDocumentItem,
+    TextDocumentSyncKind,
+    VersionedTextDocumentIdentifier,
+)
+from pygls.workspace import Workspace
+
+from intc_lsp.src.resolve import IntcResolve
+
+
+@pytest.fixture
+def server():
+    """the minimal server used by the resolver, every document is an entry"""
+    return SimpleNamespace(
+        workspace=Workspace("file:///tmp", TextDocumentSyncKind.Incremental),
+        entry_pattern=re.compile(".*"),
+        modules_pattern="",
+    )
+
+
+@pytest.fixture
+def resolver(server):
+    return IntcResolve(server)
+
+
+def open_document(server, uri: str, source: str, version: int = 0):
+    """open the document in the workspace of the server"""
+    server.workspace.put_text_document(
+        TextDocumentItem(uri=uri, language_id="json", version=version, text=source)
+    )
+
+
+def change_document(server, resolver, uri: str, changes, version: int):
+    """apply the changes to the document like the `didChange` handler"""
+    for change in changes:
+        server.workspace.update_text_document(
+            VersionedTextDocumentIdentifier(uri=uri, version=version), change
+        )
+    resolver.update_document(uri, changes)
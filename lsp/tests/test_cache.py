@@ -0,0 +1,103 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+from intc import ic_repo
+from lsprotocol.types import Position, Range, TextDocumentContentChangeEvent_Type1
+
+from conftest import change_document, open_document
+from intc_lsp.src.cache import DocumentCache, DocumentState
+
+URI = "file:///tmp/config.json"
+
+SOURCE = """{
+    "_base": "config_a",
+    "epsilon": 0.1
+}"""
+
+
+def test_document_state():
+    state = DocumentState(max_cursors=2)
+    assert state.at_version(1)
+    state.parser_tree = {"__type": "document"}
+    state.diagnostics, state.diagnostics_key = [], 0
+    state.set_cursor("a", 1)
+    assert state.at_version(1)
+    assert state.parser_tree is not None and state.get_cursor("a") == 1
+
+    # the least recently used cursor is dropped
+    state.set_cursor("b", 2)
+    state.get_cursor("a")
+    state.set_cursor("c", 3)
+    assert list(state.cursors) == ["a", "c"]
+
+    # the results of the other versions are dropped, the unknown version is never cached
+    trace_index = state.trace_index
+    assert state.at_version(2)
+    assert state.parser_tree is None and state.diagnostics is None
+    assert not state.cursors and state.trace_index is not trace_index
+    assert not state.at_version(None)
+    assert not state.at_version(None)
+
+
+def test_document_cache():
+    cache = DocumentCache(max_documents=2)
+    first = cache.get("a")
+    cache.get("b")
+    assert cache.get("a") is first
+    # the least recently used document is dropped
+    cache.get("c")
+    assert "a" in cache and "b" not in cache and "c" in cache
+    cache.pop("a")
+    cache.pop("a")
+    assert "a" not in cache
+
+
+def test_parser_tree_cache(server, resolver):
+    open_document(server, URI, SOURCE, version=1)
+    tree = resolver.parser_tree(URI, None)
+    assert resolver.parser_tree(URI, None) is tree
+    # the source which is not the document source is not cached
+    other = resolver.parser_tree(URI, SOURCE.replace("0.1", "0.2"))
+    assert other is not tree and resolver.parser_tree(URI, None) is tree
+
+    change = TextDocumentContentChangeEvent_Type1(
+        range=Range(
+            start=Position(line=2, character=17), end=Position(line=2, character=18)
+        ),
+        text="3",
+    )
+    change_document(server, resolver, URI, [change], version=2)
+    new_tree = resolver.parser_tree(URI, None)
+    assert new_tree is not tree
+    assert new_tree == resolver.json_parser.parser(SOURCE.replace("0.1", "0.3"))
+
+    resolver.close_document(URI)
+    assert URI not in resolver.documents
+
+
+def test_diagnostics_cache(server, resolver):
+    open_document(server, URI, SOURCE, version=1)
+    diagnostics = resolver.diagnostics(URI)
+    assert resolver.diagnostics(URI) is diagnostics
+
+    # the diagnostics are resolved again when the registered modules are changed
+    ic_repo[("test_cache", "module")] = {}
+    try:
+        repo_diagnostics = resolver.diagnostics(URI)
+        assert repo_diagnostics is not diagnostics
+        assert resolver.diagnostics(URI) is repo_diagnostics
+    finally:
+        ic_repo.pop(("test_cache", "module"), None)
+
+    # and when the document is changed
+    diagnostics = resolver.diagnostics(URI)
+    change = TextDocumentContentChangeEvent_Type1(
+        range=Range(
+            start=Position(line=3, character=1), end=Position(line=3, character=1)
+        ),
+        text="\n",
+    )
+    change_document(server, resolver, URI, [change], version=2)
+    assert resolver.diagnostics(URI) is not diagnostics
@@ -0,0 +1,167 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+import random
+
+import pytest
+from lsprotocol.types import (
+    Position,
+    Range,
+    TextDocumentContentChangeEvent_Type1,
+    TextDocumentContentChangeEvent_Type2,
+)
+from pygls.workspace import TextDocument
+
+from intc_lsp.src.edit import EditableTree, get_byte_point, get_edit
+from intc_lsp.src.parser_json import JsonParser
+from intc_lsp.src.parser_yaml import YamlParser
+
+JSON_SOURCE = """{
+    "_base": "config_a", // the 😀 base
+    "@child#1": {
+        "name": "值😀𝄞",
+        "list": [1, 2.0, "three"],
+    },
+    "epsilon": 0.1
+}"""
+
+YAML_SOURCE = """_base: config_a  # the 😀 base
+"@child#1":
+  name: 值😀𝄞
+  list:
+    - 1
+    - "three"
+epsilon: 0.1
+"""
+
+INSERT_TEXTS = [
+    "",
+    "a",
+    "😀",
+    "𝄞x",
+    "值",
+    "\r\n",
+    "\n",
+    '"k": 1,',
+    "- 2\n",
+    "  ",
+    "{",
+    "}",
+]
+
+
+@pytest.fixture(scope="module")
+def json_parser():
+    return JsonParser()
+
+
+@pytest.fixture(scope="module")
+def yaml_parser():
+    return YamlParser()
+
+
+def node_spans(node):
+    """the (type, byte range, point range) of all the nodes in the tree"""
+    spans = []
+    cursor = node.walk()
+    visited_children = False
+    while True:
+        if not visited_children:
+            node = cursor.node
+            spans.append(
+                (
+                    node.type,
+                    node.start_byte,
+                    node.end_byte,
+                    tuple(node.start_point),
+                    tuple(node.end_point),
+                )
+            )
+            if cursor.goto_first_child():
+                continue
+        if cursor.goto_next_sibling():
+            visited_children = False
+        elif cursor.goto_parent():
+            visited_children = True
+        else:
+            return spans
+
+
+def random_position(lines, rng):
+    """a valid LSP position(the character is counted in utf-16 code units and never splits a surrogate pair or the line break)"""
+    line = rng.randrange(len(lines))
+    text = lines[line].rstrip("\r\n")
+    index = rng.randint(0, len(text))
+    return Position(line=line, character=len(text[:index].encode("utf-16-le")) // 2)
+
+
+def random_change(document, rng):
+    """a random content change of the document, most changes have range"""
+    if rng.random() < 0.05:
+        return TextDocumentContentChangeEvent_Type2(text=document.source + "\n")
+    lines = document.lines or [""]
+    start, end = sorted(
+        [random_position(lines, rng), random_position(lines, rng)],
+        key=lambda position: (position.line, position.character),
+    )
+    return TextDocumentContentChangeEvent_Type1(
+        range=Range(start=start, end=end), text=rng.choice(INSERT_TEXTS)
+    )
+
+
+def test_get_byte_point():
+    source = "a😀b\r\n值c".encode("utf8")
+    assert get_byte_point(source, 0, 0) == (0, 0)
+    # the astral character is 2 utf-16 code units and 4 utf-8 bytes
+    assert get_byte_point(source, 0, 1) == (1, 1)
+    assert get_byte_point(source, 0, 3) == (5, 5)
+    assert get_byte_point(source, 0, 4) == (6, 6)
+    assert get_byte_point(source, 1, 1) == (11, 3)
+    # the position after the line end means the line end, after the last line means the source end
+    assert get_byte_point(source, 1, 10) == (len(source), 4)
+    assert get_byte_point(source, 5, 0) == (len(source), 4)
+
+
+def test_get_edit_at_eof():
+    source = b'{"a": 1}'
+    change = Range(
+        start=Position(line=0, character=8), end=Position(line=0, character=8)
+    )
+    edit, new_source = get_edit(source, change, "\r\n😀")
+    assert new_source == '{"a": 1}\r\n😀'.encode("utf8")
+    assert edit["start_byte"] == edit["old_end_byte"] == len(source)
+    assert edit["new_end_byte"] == len(new_source)
+    assert edit["new_end_point"] == (1, 4)
+
+
+@pytest.mark.parametrize(
+    "source, parser_name",
+    [
+        (JSON_SOURCE, "json_parser"),
+        (JSON_SOURCE.replace("\n", "\r\n"), "json_parser"),
+        (YAML_SOURCE, "yaml_parser"),
+        (YAML_SOURCE.replace("\n", "\r\n"), "yaml_parser"),
+    ],
+    ids=["json", "json-crlf", "yaml", "yaml-crlf"],
+)
+def test_editable_tree(source, parser_name, request):
+    parser = request.getfixturevalue(parser_name)
+    rng = random.Random(f"{parser_name}{source}")
+    document = TextDocument("file:///tmp/test", source)
+    tree = EditableTree(parser)
+    edited_tree = tree.parse(document.source)
+    for _ in range(200):
+        spans = node_spans(edited_tree.root_node)
+        # one event may contain several changes, they are applied in order
+        for _ in range(rng.randint(1, 3)):
+            change = random_change(document, rng)
+            document.apply_change(change)
+            tree.apply_change(change)
+        # the returned tree is not edited by the changes
+        assert node_spans(edited_tree.root_node) == spans
+        assert tree.source_byte == document.source.encode("utf8")
+        edited_tree = tree.parse(document.source)
+        full_tree = parser.parse(document.source.encode("utf8"))
+        assert node_spans(edited_tree.root_node) == node_spans(full_tree.root_node)
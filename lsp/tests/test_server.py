@@ -0,0 +1,124 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from lsprotocol.types import TextDocumentSyncKind
+from pygls.workspace import Workspace
+
+from conftest import open_document
+from intc_lsp.server import IntcLanguageServer
+
+URI = "file:///tmp/config.json"
+
+SOURCE = """{
+    "_base": "config_a",
+    "epsilon": 0.1
+}"""
+
+
+@pytest.fixture
+def lsp_server():
+    """the server with a short delay, the resolved and published diagnostics are recorded"""
+    server = IntcLanguageServer("test-server", "0", diagnostics_delay=0.05)
+    server.lsp._workspace = Workspace("file:///tmp", TextDocumentSyncKind.Incremental)
+    server.resolved, server.published = [], []
+    # the worker waits for the gate, so the document can be changed while the diagnostics is running
+    server.gate = threading.Event()
+    server.gate.set()
+
+    def diagnostics(uri):
+        version = server.workspace.get_text_document(uri).version
+        server.resolved.append(version)
+        server.gate.wait(timeout=5)
+        return [f"diagnostics of version {version}"]
+
+    def publish_diagnostics(uri, diagnostics, version=None):
+        server.published.append((uri, diagnostics, version))
+
+    server.resolve = SimpleNamespace(diagnostics=diagnostics)
+    server.publish_diagnostics = publish_diagnostics
+    yield server
+    server.gate.set()
+    server.shutdown()
+
+
+def run(server, seconds: float):
+    """run the event loop of the server for a while"""
+    server.loop.run_until_complete(asyncio.sleep(seconds))
+
+
+def wait_diagnostics(server):
+    """run the event loop until all the scheduled diagnostics are done"""
+    while server.diagnostics_tasks:
+        server.loop.run_until_complete(
+            asyncio.wait(list(server.diagnostics_tasks.values()))
+        )
+
+
+def test_debounce_edits(lsp_server):
+    open_document(lsp_server, URI, SOURCE, version=1)
+    lsp_server.schedule_diagnostics(URI)
+    # the burst of the edits only publishes the diagnostics of the latest version
+    for version in range(2, 6):
+        run(lsp_server, 0.01)
+        open_document(lsp_server, URI, SOURCE, version=version)
+        lsp_server.schedule_diagnostics(URI)
+    wait_diagnostics(lsp_server)
+    assert lsp_server.resolved == [5]
+    assert lsp_server.published == [(URI, ["diagnostics of version 5"], 5)]
+
+
+def test_cancel_diagnostics(lsp_server):
+    open_document(lsp_server, URI, SOURCE, version=1)
+    lsp_server.schedule_diagnostics(URI)
+    task = lsp_server.diagnostics_tasks[URI]
+    # the newer version cancels the pending diagnostics
+    open_document(lsp_server, URI, SOURCE, version=2)
+    lsp_server.schedule_diagnostics(URI)
+    run(lsp_server, 0)
+    assert task.cancelled()
+
+    # the `didClose` cancels the pending diagnostics
+    task = lsp_server.diagnostics_tasks[URI]
+    lsp_server.cancel_diagnostics(URI)
+    run(lsp_server, 0.1)
+    assert task.cancelled() and URI not in lsp_server.diagnostics_tasks
+    assert lsp_server.resolved == [] and lsp_server.published == []
+
+    # the running diagnostics is cancelled by the newer version, its result is dropped
+    lsp_server.gate.clear()
+    lsp_server.schedule_diagnostics(URI, delay=0)
+    task = lsp_server.diagnostics_tasks[URI]
+    run(lsp_server, 0.05)
+    assert lsp_server.resolved == [2]
+    open_document(lsp_server, URI, SOURCE, version=3)
+    lsp_server.schedule_diagnostics(URI)
+    lsp_server.gate.set()
+    wait_diagnostics(lsp_server)
+    assert task.cancelled()
+    assert lsp_server.resolved == [2, 3]
+    assert lsp_server.published == [(URI, ["diagnostics of version 3"], 3)]
+
+
+def test_drop_stale_diagnostics(lsp_server):
+    open_document(lsp_server, URI, SOURCE, version=1)
+    lsp_server.gate.clear()
+    lsp_server.schedule_diagnostics(URI, delay=0)
+    run(lsp_server, 0.05)
+    assert lsp_server.resolved == [1]
+    # the document is changed while resolving(without scheduling the new diagnostics)
+    open_document(lsp_server, URI, SOURCE, version=2)
+    lsp_server.gate.set()
+    wait_diagnostics(lsp_server)
+    assert lsp_server.published == []
+
+    # the result is published when the document is unchanged
+    lsp_server.schedule_diagnostics(URI, delay=0)
+    wait_diagnostics(lsp_server)
+    assert lsp_server.published == [(URI, ["diagnostics of version 2"], 2)]
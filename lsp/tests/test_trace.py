@@ -0,0 +1,114 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+import random
+
+import pytest
+
+from intc_lsp.src.parser_json import JsonParser
+from intc_lsp.src.parser_yaml import YamlParser
+from intc_lsp.src.trace import TraceIndex, children_in_range, root_trace
+
+JSON_SOURCE = """{
+    "_base": "config_a", // comment
+    "@child#1": {"_name": "child_a", "value": "值😀"},
+    "@child#2": {
+        "_anchor": "anchor",
+        "list": [1, 2.0, "three"],
+        "nested": {"key": "@$.epsilon"}
+    },
+    "epsilon": 0.1
+}"""
+
+YAML_SOURCE = """_base: config_a  # comment
+"@child#1":
+  _name: child_a
+  value: 值😀
+"@child#2":
+  _anchor: anchor
+  list:
+    - 1
+    - "three"
+  nested:
+    key: "@$.epsilon"
+epsilon: 0.1
+"""
+
+
+def linear_scan(children, position):
+    """the scan over all the children used before the index"""
+    return children_in_range(children, position, None)
+
+
+def boundary_positions(children):
+    """the positions at and around the boundaries of the children"""
+    positions = set()
+    for child in children:
+        for row, col in child["__range"]:
+            for d_row in (-1, 0, 1):
+                for d_col in (-1, 0, 1):
+                    positions.add((max(row + d_row, 0), max(col + d_col, 0)))
+    return sorted(positions)
+
+
+def random_children(rng, sorted_ranges=True):
+    """the children with random ranges, the adjacent children may touch or leave a gap, and some children are empty"""
+    children = []
+    row, col = 0, 0
+    for _ in range(rng.randint(0, 12)):
+        if rng.random() < 0.3:
+            row, col = row + rng.randint(0, 2), rng.randint(0, 4)
+        else:
+            col += rng.randint(0, 3)
+        start = (row, col)
+        if rng.random() < 0.3:
+            row, col = row + rng.randint(1, 2), rng.randint(0, 5)
+        else:
+            col += rng.randint(0, 6)
+        children.append({"__type": "pair", "__range": (start, (row, col))})
+    if not sorted_ranges:
+        rng.shuffle(children)
+    return children
+
+
+@pytest.mark.parametrize("sorted_ranges", [True, False])
+def test_children_in_range(sorted_ranges):
+    rng = random.Random(sorted_ranges)
+    for _ in range(300):
+        children = random_children(rng, sorted_ranges)
+        index = TraceIndex()
+        for position in boundary_positions(children):
+            assert index.children_in_range(children, position) == linear_scan(
+                children, position
+            )
+
+
+def test_overlapped_children():
+    children = [
+        {"__type": "pair", "__range": ((0, 0), (2, 0))},
+        {"__type": "pair", "__range": ((1, 0), (1, 5))},
+    ]
+    index = TraceIndex()
+    assert index.children_in_range(children, (1, 2)) == [0, 1]
+    assert index.children_in_range(children, (2, 0)) == []
+
+
+@pytest.mark.parametrize(
+    "parser_class, source",
+    [(JsonParser, JSON_SOURCE), (YamlParser, YAML_SOURCE)],
+    ids=["json", "yaml"],
+)
+def test_root_trace(parser_class, source):
+    parser = parser_class()
+    tree = parser.parser(source)
+    index = TraceIndex()
+    lines = source.split("\n")
+    for line, text in enumerate(lines):
+        # the utf-16 columns of the line and the columns after the line end
+        for character in range(len(text.encode("utf-16-le")) // 2 + 2):
+            position = (line, character)
+            assert root_trace(tree, position, "", index) == root_trace(
+                tree, position, "", None
+            )
@@ -0,0 +1,118 @@
+# Copyright the author(s) of intc.
+#
+# This source code is licensed under the Apache license found in the
+# LICENSE file in the root directory of this source tree.
+
+import copy
+import json
+import pickle
+import random
+
+import pytest
+
+from intc_lsp.src.parser_json import JsonParser
+from intc_lsp.src.parser_yaml import YamlParser
+from intc_lsp.src.view import NodeView
+
+JSON_SOURCE = """{
+    "_base": "config_a", // comment
+    "@child#1": {"_name": "child_a", "value": "值😀"},
+    "list": [1, 2.0, "three", [true, null]],
+    "epsilon": 0.1
+}"""
+
+YAML_SOURCE = """_base: config_a  # comment
+"@child#1":
+  _name: child_a
+  value: 值😀
+list:
+  - 1
+  - "three"
+epsilon: 0.1
+"""
+
+
+def to_dict(value):
+    """convert the views in the tree to the plain dicts"""
+    if isinstance(value, NodeView):
+        value.load()
+    if isinstance(value, dict):
+        return {key: to_dict(dict.__getitem__(value, key)) for key in value}
+    if isinstance(value, list):
+        return [to_dict(item) for item in value]
+    return value
+
+
+def random_access(value, rng):
+    """access some fields of the views in the tree in random order"""
+    if isinstance(value, NodeView):
+        keys = list(value._loaders)
+        rng.shuffle(keys)
+        for key in keys[: rng.randint(0, len(keys))]:
+            random_access(value[key], rng)
+    elif isinstance(value, list):
+        for item in value:
+            random_access(item, rng)
+
+
+def test_node_view():
+    calls = []
+
+    def loader(key, value):
+        def _():
+            calls.append(key)
+            return value
+
+        return _
+
+    view = NodeView(
+        "pair",
+        ((0, 0), (0, 5)),
+        {"__key": loader("__key", "k"), "__value": loader("__value", 1)},
+    )
+    # the membership, length, get of missing key and repr do not convert the fields
+    assert "__key" in view and "__type" in view and "missing" not in view
+    assert len(view) == 4
+    assert view.get("missing", 0) == 0
+    assert "<lazy>" in repr(view)
+    assert calls == []
+
+    assert view["__value"] == 1 and view.get("__key") == "k"
+    assert view["__value"] == 1
+    assert calls == ["__value", "__key"]
+    with pytest.raises(KeyError):
+        view["missing"]
+
+    eager = {"__type": "pair", "__range": ((0, 0), (0, 5)), "__key": "k", "__value": 1}
+    assert view == eager and eager == view and not view != eager
+    view["__value"] = 2
+    del view["__key"]
+    assert view == {"__type": "pair", "__range": ((0, 0), (0, 5)), "__value": 2}
+
+
+@pytest.mark.parametrize(
+    "parser_class, source",
+    [(JsonParser, JSON_SOURCE), (YamlParser, YAML_SOURCE)],
+    ids=["json", "yaml"],
+)
+def test_lazy_tree(parser_class, source):
+    parser = parser_class()
+    # the root is the list of the documents
+    eager = to_dict(parser.parser(source))
+    assert [document["__type"] for document in eager] == ["document"]
+    for seed in range(20):
+        tree = parser.parser(source)
+        assert isinstance(tree[0], NodeView)
+        random_access(tree, random.Random(seed))
+        # the membership does not depend on whether the fields are converted
+        for key in eager[0]:
+            assert key in tree[0]
+        assert "missing" not in tree[0]
+        assert len(tree[0]) == len(eager[0])
+        # dump the partially converted tree, the comparison converts all the fields
+        assert json.dumps(tree, sort_keys=True) == json.dumps(eager, sort_keys=True)
+        assert tree == eager
+        # the views are pickled as the plain dicts
+        pickled = pickle.loads(pickle.dumps(tree))
+        assert pickled == eager and type(pickled[0]) is dict
+        assert copy.deepcopy(tree) == eager